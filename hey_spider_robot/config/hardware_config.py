@@ -1,17 +1,44 @@
-# Hardware pin definitions
-SERVO_PINS = {
+from enum import IntEnum
+from types import MappingProxyType
+
+# Hardware pin definitions (read-only lookup tables)
+SERVO_PINS = MappingProxyType({
     'leg1_shoulder': 0,  'leg1_elbow': 1,  'leg1_foot': 2,
     'leg2_shoulder': 3,  'leg2_elbow': 4,  'leg2_foot': 5,
     'leg3_shoulder': 6,  'leg3_elbow': 7,  'leg3_foot': 8,
     'leg4_shoulder': 9,  'leg4_elbow': 10, 'leg4_foot': 11
-}
+})
+
+# Servo channels indexed by (leg - 1) * 3 + joint, joint order shoulder/elbow/foot
+SERVO_JOINTS = ('shoulder', 'elbow', 'foot')
+SERVO_PIN_ARRAY = tuple(
+    SERVO_PINS[f'leg{leg}_{joint}'] for leg in range(1, 5) for joint in SERVO_JOINTS
+)
+
+class Joint(IntEnum):
+    """Index of each servo in per-joint arrays (same order as SERVO_PIN_ARRAY)"""
+    LEG1_SHOULDER = 0
+    LEG1_ELBOW = 1
+    LEG1_FOOT = 2
+    LEG2_SHOULDER = 3
+    LEG2_ELBOW = 4
+    LEG2_FOOT = 5
+    LEG3_SHOULDER = 6
+    LEG3_ELBOW = 7
+    LEG3_FOOT = 8
+    LEG4_SHOULDER = 9
+    LEG4_ELBOW = 10
+    LEG4_FOOT = 11
+
+# Servo name ('leg1_elbow') -> Joint
+JOINT_OF = MappingProxyType({joint.name.lower(): joint for joint in Joint})
 
-ULTRASONIC_PINS = {
+ULTRASONIC_PINS = MappingProxyType({
     'trigger': 23,
     'echo': 24
-}
+})
 
-I2C_ADDRESSES = {
+I2C_ADDRESSES = MappingProxyType({
     'pca9685': 0x40,
     'oled': 0x3C
-}
\ No newline at end of file
+})
@@ -1,25 +1,78 @@
 import os
 from dataclasses import dataclass
+from pathlib import Path
 
-@dataclass
+__all__ = ('Settings', 'settings')
+
+def _env_flag(name: str, default: bool = True) -> bool:
+    """Read a boolean toggle from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ('0', 'false', 'no', 'off')
+
+# Frozen + slotted: every value is read from the environment once at import
+# and attribute reads on the shared instance are plain slot lookups
+@dataclass(frozen=True, slots=True)
 class Settings:
     # API Keys
     OPENAI_API_KEY: str = os.getenv('OPENAI_API_KEY', '')
     
+    # Subsystem toggles (disable for headless/mock runs)
+    ENABLE_OLED: bool = _env_flag('ENABLE_OLED')
+    ENABLE_VOICE: bool = _env_flag('ENABLE_VOICE')
+    
     # Voice Settings
-    WAKE_PHRASE: str = "hey spider"
+    WAKE_PHRASE: str = os.getenv('WAKE_PHRASE', "hey spider").lower()
     VOICE_TIMEOUT: int = 5
+    # On-device wake word (Picovoice Porcupine); needs an access key and a
+    # "hey spider" keyword file trained in the Picovoice console
+    PORCUPINE_ACCESS_KEY: str = os.getenv('PORCUPINE_ACCESS_KEY', '')
+    PORCUPINE_KEYWORD_PATH: str = os.getenv('PORCUPINE_KEYWORD_PATH', '')
     
     # Vision Settings
     AUTO_CAPTURE_INTERVAL: int = 30
+    CAMERA_PIPELINE: str = os.getenv('CAMERA_PIPELINE', '')
     CONFIDENCE_THRESHOLD: float = 0.5
+    MOTION_MIN_CHANGED: float = 0.01      # fraction of pixels that must change to rerun YOLO
+    MOTION_MAX_SKIPS: int = 10            # rerun anyway after this many static intervals
+    YOLO_MODEL: str = os.getenv('YOLO_MODEL', "yolov8n.pt")
+    YOLO_IMAGE_SIZE: int = 640
+    # Opt-in: the first start then spends several minutes exporting the engine
+    YOLO_TENSORRT: bool = _env_flag('YOLO_TENSORRT', False)
+    YOLO_GPU_PREPROCESS: bool = _env_flag('YOLO_GPU_PREPROCESS')
+    YOLO_BATCH_SIZE: int = 8
     
     # AI Settings
     AI_THINKING_INTERVAL: int = 15
-    AI_MODEL: str = "gpt-3.5-turbo"
+    AI_THOUGHT_REFRESH_INTERVAL: int = 120
+    AI_MODEL: str = os.getenv('AI_MODEL', "gpt-3.5-turbo")
+    # Under the project directory: the systemd unit (ProtectHome=yes) only lets
+    # the robot write there. Anchored to this file, not the working directory
+    AI_CACHE_PATH: str = os.getenv('AI_CACHE_PATH',
+                                   str(Path(__file__).resolve().parent.parent / 'cache' / 'ai_cache.json'))
+    AI_MAX_CONCURRENT_REQUESTS: int = 2
+    AI_REQUEST_TIMEOUT: float = 30.0
+    AI_MAX_REQUESTS_PER_MINUTE: int = 500
+    AI_MAX_TOKENS_PER_MINUTE: int = 90_000
+    AI_COMMAND_CACHE_SIZE: int = 256
+    AI_COMMAND_CACHE_TTL: int = 3600
     
     # Web Settings
-    WEB_PORT: int = 5000
+    WEB_PORT: int = int(os.getenv('WEB_PORT', '5000'))
+    WEB_ASYNC_MODE: str = os.getenv('WEB_ASYNC_MODE', "threading")
+    WEB_WEBSOCKET_ONLY: bool = _env_flag('WEB_WEBSOCKET_ONLY', False)
+    WEB_STATUS_INTERVAL: float = 1.0
+    WEB_STATUS_CACHE_TTL: float = 0.1
+    WEB_STATUS_SNAPSHOT_INTERVAL: float = 30.0
+    WEB_COMMAND_DEDUP_WINDOW: float = 0.2
+    WEB_VIDEO_FPS: float = 5.0
+    WEB_VIDEO_SIZE: tuple = (320, 240)
+    WEB_VIDEO_QUALITY: int = 70
+    WEB_VIDEO_STATIC_THRESHOLD: float = 2.0
+    # Longest gap between MJPEG writes; a write is how a dropped client is noticed
+    WEB_VIDEO_KEEPALIVE: float = 2.0
+    WEB_VIDEO_OPENCL: bool = _env_flag('WEB_VIDEO_OPENCL', False)
     
     # Hardware Settings
     SERVO_FREQUENCY: int = 50
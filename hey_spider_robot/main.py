@@ -7,19 +7,109 @@ Complete AI-powered spider robot system with visual feedback and modern OpenAI A
 import sys
 import time
 import signal
-import json
-import traceback
+import threading
+import logging
 import os
+from contextlib import suppress
+from typing import Tuple
+
+# Checked before the project imports, which already need 3.10 (slotted dataclasses)
+if sys.version_info < (3, 10):
+    sys.exit("❌ Python 3.10 or higher is required")
+
 from config.settings import settings
+from src import background_loop
+from src.ai_thinking import parse_ai_response, AI_RESPONSE_ERRORS
+from src.commands import SPIDER_ACTIONS, VISION_ACTIONS, keyword_action
+
+logger = logging.getLogger("spider")
+
+# Console banners, built once at import
+_SEP60 = "=" * 60
+_SEP50 = "=" * 50
+_INIT_BANNER = f"{_SEP60}\n🕷️  HEY SPIDER ROBOT - INITIALIZATION\n{_SEP60}"
+_INIT_DONE_BANNER = f"{_SEP60}\n🕷️  HEY SPIDER ROBOT - INITIALIZATION COMPLETE\n{_SEP60}"
+_START_BANNER = f"{_SEP60}\n🕷️  STARTING HEY SPIDER ROBOT SYSTEMS\n{_SEP60}"
+_ACTIVE_BANNER = f"\n{_SEP60}\n🕷️  HEY SPIDER ROBOT IS NOW ACTIVE!\n{_SEP60}"
+_VOICE_HELP = ("📢 Voice Commands:\n"
+               "   - Say 'Hey Spider' followed by a command\n"
+               "   - Available commands: walk forward, turn left/right, dance, wave, take photo")
+_ACTIVE_FOOTER = f"{_SEP60}\nPress Ctrl+C to stop\n{_SEP60}\n"
+_STOP_BANNER = f"{_SEP50}\n🛑 STOPPING HEY SPIDER ROBOT\n{_SEP50}"
+_STOPPED_BANNER = f"{_SEP50}\n✅ Hey Spider Robot stopped safely.\n{_SEP50}"
+
+class MinimalWebInterface:
+    """Fallback status page used when the full web interface fails to load"""
+    
+    def __init__(self, spider, vision, ai, voice):
+        # Flask is only imported here, on the recovery path
+        from flask import Flask, jsonify
+        self._jsonify = jsonify
+        
+        self.spider = spider
+        self.vision = vision
+        self.ai = ai
+        self.voice = voice
+        self.app = Flask(__name__)
+        self.setup_minimal_routes()
+        
+    def setup_minimal_routes(self):
+        @self.app.route('/')
+        def index():
+            return """
+            <html>
+                <head><title>Hey Spider Robot - Error</title></head>
+                <body>
+                    <h1>🕷️ Hey Spider Robot</h1>
+                    <p>System is running in minimal mode due to initialization errors.</p>
+                    <p>Check the console logs for more details.</p>
+                    <h2>Status:</h2>
+                    <ul>
+                        <li>Spider Controller: {}</li>
+                        <li>Vision System: {}</li>
+                        <li>AI System: {}</li>
+                        <li>Voice System: {}</li>
+                    </ul>
+                </body>
+            </html>
+            """.format(
+                "✅ OK" if self.spider else "❌ Error",
+                "✅ OK" if self.vision else "❌ Error", 
+                "✅ OK" if self.ai else "❌ Error",
+                "✅ OK" if self.voice else "❌ Error"
+            )
+            
+        @self.app.route('/health')
+        def health():
+            return self._jsonify({
+                'status': 'minimal_mode',
+                'components': {
+                    'spider': bool(self.spider),
+                    'vision': bool(self.vision),
+                    'ai': bool(self.ai),
+                    'voice': bool(self.voice)
+                }
+            })
+            
+    def run(self, host='0.0.0.0', port=5000, debug=False):
+        logger.info("Starting minimal web interface on http://%s:%s", host, port)
+        # The reloader would fork a second copy of the whole robot
+        self.app.run(host=host, port=port, debug=debug, use_reloader=False)
+        
+    def stop(self):
+        """Nothing to stop; the Flask server ends with the process"""
 
 class HeySpiderRobot:
+    __slots__ = ('oled', 'spider', 'vision', 'ai', 'voice', 'web', 'running',
+                 '_shutdown')
+    
     def __init__(self):
-        print("=" * 60)
-        print("🕷️  HEY SPIDER ROBOT - INITIALIZATION")
-        print("=" * 60)
-        print(f"Python version: {sys.version}")
-        print(f"Working directory: {os.getcwd()}")
-        print(f"OpenAI API Key configured: {'Yes' if settings.OPENAI_API_KEY else 'No (set OPENAI_API_KEY environment variable)'}")
+        api_key_status = 'Yes' if settings.OPENAI_API_KEY else 'No (set OPENAI_API_KEY environment variable)'
+        logger.info("%s\n"
+                    "Python version: %s\n"
+                    "Working directory: %s\n"
+                    "OpenAI API Key configured: %s",
+                    _INIT_BANNER, sys.version, os.getcwd(), api_key_status)
         
         # Initialize components with error handling
         self.oled = None
@@ -29,6 +119,7 @@ class HeySpiderRobot:
         self.voice = None
         self.web = None
         self.running = False
+        self._shutdown = threading.Event()
         
         # Initialize each component safely
         self._init_oled()
@@ -38,439 +129,331 @@ class HeySpiderRobot:
         self._init_voice()
         self._init_web()
         
-        print("=" * 60)
-        print("🕷️  HEY SPIDER ROBOT - INITIALIZATION COMPLETE")
-        print("=" * 60)
+        logger.info(_INIT_DONE_BANNER)
         
     def _init_oled(self):
         """Initialize OLED display with error handling"""
+        if not settings.ENABLE_OLED:
+            logger.warning("⚠️  OLED display disabled (ENABLE_OLED=false)")
+            return
+            
         try:
-            print("Initializing OLED display...")
+            logger.info("Initializing OLED display...")
             from src.oled_display import OLEDDisplay
             self.oled = OLEDDisplay()
             if self.oled.display:
                 self.oled.show_startup_message()
                 self.oled.start()
-                print("✅ OLED display initialized successfully")
+                logger.info("✅ OLED display initialized successfully")
             else:
-                print("⚠️  OLED display initialized in mock mode")
+                logger.warning("⚠️  OLED display initialized in mock mode")
         except Exception as e:
-            print(f"❌ OLED display initialization failed: {e}")
-            traceback.print_exc()
+            logger.exception("❌ OLED display initialization failed: %s", e)
             self.oled = None
             
     def _init_spider(self):
         """Initialize spider controller with error handling"""
         try:
-            print("Initializing spider controller...")
+            logger.info("Initializing spider controller...")
             from src.spider_controller import SpiderController
             self.spider = SpiderController(self.oled)
-            print("✅ Spider controller initialized successfully")
+            logger.info("✅ Spider controller initialized successfully")
         except Exception as e:
-            print(f"❌ Spider controller initialization failed: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Spider controller initialization failed: %s", e)
             self.spider = None
             
     def _init_vision(self):
         """Initialize visual monitoring with error handling"""
         try:
-            print("Initializing visual monitoring...")
+            logger.info("Initializing visual monitoring...")
             from src.visual_monitor import VisualMonitor
             self.vision = VisualMonitor(self.oled)
-            print("✅ Visual monitoring initialized successfully")
+            logger.info("✅ Visual monitoring initialized successfully")
         except Exception as e:
-            print(f"❌ Visual monitoring initialization failed: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Visual monitoring initialization failed: %s", e)
             self.vision = None
             
     def _init_ai(self):
         """Initialize AI thinking with error handling"""
         try:
-            print("Initializing AI thinking...")
+            logger.info("Initializing AI thinking...")
             from src.ai_thinking import AIThinking
             self.ai = AIThinking(self.spider, self.vision, self.oled)
-            print("✅ AI thinking initialized successfully")
+            logger.info("✅ AI thinking initialized successfully")
         except Exception as e:
-            print(f"❌ AI thinking initialization failed: {e}")
-            traceback.print_exc()
+            logger.exception("❌ AI thinking initialization failed: %s", e)
             self.ai = None
             
     def _init_voice(self):
         """Initialize voice activation with error handling"""
+        if not settings.ENABLE_VOICE:
+            logger.warning("⚠️  Voice activation disabled (ENABLE_VOICE=false)")
+            return
+            
         try:
-            print("Initializing voice activation...")
+            logger.info("Initializing voice activation...")
             from src.voice_activation import VoiceActivation
             self.voice = VoiceActivation(self.handle_voice_command, self.oled)
-            print("✅ Voice activation initialized successfully")
+            logger.info("✅ Voice activation initialized successfully")
         except Exception as e:
-            print(f"❌ Voice activation initialization failed: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Voice activation initialization failed: %s", e)
             self.voice = None
             
     def _init_web(self):
         """Initialize web interface with error handling"""
         try:
-            print("Initializing web interface...")
+            logger.info("Initializing web interface...")
             from src.web_interface import WebInterface
             self.web = WebInterface(self.spider, self.vision, self.ai, self.oled)
-            print("✅ Web interface initialized successfully")
+            logger.info("✅ Web interface initialized successfully")
         except Exception as e:
-            print(f"❌ Web interface initialization failed: {e}")
-            traceback.print_exc()
+            logger.exception("❌ Web interface initialization failed: %s", e)
             # Try to create a minimal web interface
             try:
-                print("Attempting to create minimal web interface...")
-                from flask import Flask, jsonify
-                
-                class MinimalWebInterface:
-                    def __init__(self):
-                        self.app = Flask(__name__)
-                        self.setup_minimal_routes()
-                        
-                    def setup_minimal_routes(self):
-                        @self.app.route('/')
-                        def index():
-                            return """
-                            <html>
-                                <head><title>Hey Spider Robot - Error</title></head>
-                                <body>
-                                    <h1>🕷️ Hey Spider Robot</h1>
-                                    <p>System is running in minimal mode due to initialization errors.</p>
-                                    <p>Check the console logs for more details.</p>
-                                    <h2>Status:</h2>
-                                    <ul>
-                                        <li>Spider Controller: {}</li>
-                                        <li>Vision System: {}</li>
-                                        <li>AI System: {}</li>
-                                        <li>Voice System: {}</li>
-                                    </ul>
-                                </body>
-                            </html>
-                            """.format(
-                                "✅ OK" if self.spider else "❌ Error",
-                                "✅ OK" if self.vision else "❌ Error", 
-                                "✅ OK" if self.ai else "❌ Error",
-                                "✅ OK" if self.voice else "❌ Error"
-                            )
-                            
-                        @self.app.route('/health')
-                        def health():
-                            return jsonify({
-                                'status': 'minimal_mode',
-                                'components': {
-                                    'spider': bool(self.spider),
-                                    'vision': bool(self.vision),
-                                    'ai': bool(self.ai),
-                                    'voice': bool(self.voice)
-                                }
-                            })
-                            
-                    def run(self, host='0.0.0.0', port=5000, debug=False):
-                        print(f"Starting minimal web interface on http://{host}:{port}")
-                        self.app.run(host=host, port=port, debug=debug)
-                
-                # Store references for minimal interface
-                minimal_web = MinimalWebInterface()
-                minimal_web.spider = self.spider
-                minimal_web.vision = self.vision
-                minimal_web.ai = self.ai
-                minimal_web.voice = self.voice
-                
-                self.web = minimal_web
-                print("✅ Minimal web interface created successfully")
+                logger.info("Attempting to create minimal web interface...")
+                self.web = MinimalWebInterface(self.spider, self.vision, self.ai, self.voice)
+                logger.info("✅ Minimal web interface created successfully")
                 
             except Exception as e2:
-                print(f"❌ Even minimal web interface creation failed: {e2}")
+                logger.error("❌ Even minimal web interface creation failed: %s", e2)
                 self.web = None
                 
     def handle_voice_command(self, command: str):
         """Handle voice commands with error handling"""
-        print(f"Processing voice command: {command}")
+        logger.info("Processing voice command: %s", command)
         
-        try:
-            if self.oled:
-                self.oled.update_command(command)
-        except Exception as e:
-            print(f"OLED update error: {e}")
+        # Normalize once; keyword dispatch and the AI both work on this copy
+        cmd = ' '.join(command.lower().split())
+        
+        # Resolve subsystems once for the whole command
+        oled = self.oled
+        spider = self.spider
+        vision = self.vision
+        
+        if oled:
+            self._safe("OLED update", oled.update_command, command)
             
         try:
-            # Basic movement commands
-            if any(word in command for word in ['forward', 'walk', 'move']):
-                if self.spider:
-                    self.spider.walk_forward()
-                else:
-                    print("Spider controller not available")
-                    
-            elif 'left' in command:
-                if self.spider:
-                    self.spider.turn_left()
-                else:
-                    print("Spider controller not available")
-                    
-            elif 'right' in command:
-                if self.spider:
-                    self.spider.turn_right()
-                else:
-                    print("Spider controller not available")
-                    
-            elif 'dance' in command:
-                if self.spider:
-                    self.spider.dance()
-                else:
-                    print("Spider controller not available")
-                    
-            elif 'wave' in command:
-                if self.spider:
-                    self.spider.wave()
-                else:
-                    print("Spider controller not available")
-                    
-            elif any(word in command for word in ['photo', 'picture', 'capture']):
-                if self.vision:
-                    filename = self.vision.capture_photo()
-                    print(f"Photo captured: {filename}" if filename else "Photo capture failed")
+            # Keyword commands - the highest-priority action named wins
+            action = keyword_action(cmd)
+            if action:
+                if action == 'take_photo':
+                    if vision:
+                        filename = vision.capture_photo()
+                        if filename:
+                            logger.info("Photo captured: %s", filename)
+                        else:
+                            logger.warning("Photo capture failed")
+                    else:
+                        logger.warning("Vision system not available")
+                        
+                elif action == 'stop':
+                    logger.info("Stopping robot...")
+                    if oled:
+                        oled.update_mode("STOPPED")
+                        
+                elif spider:
+                    SPIDER_ACTIONS[action](spider)
                 else:
-                    print("Vision system not available")
-                    
-            elif 'stop' in command:
-                print("Stopping robot...")
-                if self.oled:
-                    self.oled.update_mode("STOPPED")
+                    logger.warning("Spider controller not available")
                     
             else:
                 # Use AI to process unknown commands
                 if self.ai:
                     try:
-                        ai_response = self.ai.process_command(command)
-                        parsed_response = json.loads(ai_response)
-                        action = parsed_response.get('action', 'unknown')
-                        response_message = parsed_response.get('response', 'Command processed')
+                        action, response_message = self._ai_action(cmd)
                         
-                        print(f"AI Response: {response_message}")
+                        logger.info("AI Response: %s", response_message)
                         
                         # Execute AI-determined action
-                        if action == 'walk_forward' and self.spider:
-                            self.spider.walk_forward()
-                        elif action == 'turn_left' and self.spider:
-                            self.spider.turn_left()
-                        elif action == 'turn_right' and self.spider:
-                            self.spider.turn_right()
-                        elif action == 'dance' and self.spider:
-                            self.spider.dance()
-                        elif action == 'wave' and self.spider:
-                            self.spider.wave()
-                        elif action == 'take_photo' and self.vision:
-                            self.vision.capture_photo()
+                        spider_action = SPIDER_ACTIONS.get(action)
+                        vision_action = VISION_ACTIONS.get(action)
+                        if spider_action:
+                            if spider:
+                                spider_action(spider)
+                        elif vision_action:
+                            if vision:
+                                vision_action(vision)
                         elif action == 'unknown':
-                            print(f"Unknown command: {command}")
+                            logger.info("Unknown command: %s", command)
                             
-                    except (json.JSONDecodeError, KeyError) as e:
-                        print(f"AI response parsing error: {e}")
-                        print("Could not understand command")
+                    except AI_RESPONSE_ERRORS as e:
+                        logger.warning("AI response parsing error: %s", e)
+                        logger.warning("Could not understand command")
                 else:
-                    print("AI system not available for command processing")
+                    logger.warning("AI system not available for command processing")
                 
         except Exception as e:
-            print(f"Command execution error: {e}")
-            traceback.print_exc()
-            if self.oled:
-                try:
-                    self.oled.update_mode("ERROR")
+            logger.exception("Command execution error: %s", e)
+            if oled:
+                with suppress(Exception):
+                    oled.update_mode("ERROR")
                     time.sleep(2)
-                except:
-                    pass
                 
         finally:
-            if self.oled:
-                try:
-                    self.oled.update_mode("LISTENING")
-                except:
-                    pass
+            if oled:
+                with suppress(Exception):
+                    oled.update_mode("LISTENING")
                 
+    def _ai_action(self, cmd: str) -> Tuple[str, str]:
+        """Resolve a normalized command to (action, response) with the AI (cached by AIThinking)"""
+        parsed_response = parse_ai_response(self.ai.process_command(cmd))
+        return parsed_response.action, parsed_response.response or 'Command processed'
+        
     def start(self):
         """Start all robot systems"""
-        print("\n" + "="*60)
-        print("🕷️  STARTING HEY SPIDER ROBOT SYSTEMS")
-        print("="*60)
+        logger.info(_START_BANNER)
         
         self.running = True
+        port = settings.WEB_PORT
+        oled, spider, vision, ai, voice, web = self.oled, self.spider, self.vision, self.ai, self.voice, self.web
         
         # Start subsystems that are available
         available_systems = []
         
-        if self.vision:
-            try:
-                print("Starting visual monitoring...")
-                self.vision.start_monitoring()
-                available_systems.append("Visual Monitoring")
-            except Exception as e:
-                print(f"Failed to start visual monitoring: {e}")
+        subsystems = (
+            ("Visual Monitoring", vision, 'start_monitoring'),
+            ("AI Thinking", ai, 'start_thinking'),
+            ("Voice Activation", voice, 'start_listening')
+        )
+        for name, system, start_method in subsystems:
+            if not system:
+                continue
+            logger.info("Starting %s...", name)
+            if self._safe(f"{name} startup", getattr(system, start_method)):
+                available_systems.append(name)
         
-        if self.ai:
-            try:
-                print("Starting AI thinking...")
-                self.ai.start_thinking()
-                available_systems.append("AI Thinking")
-            except Exception as e:
-                print(f"Failed to start AI thinking: {e}")
-        
-        if self.voice:
-            try:
-                print("Starting voice activation...")
-                self.voice.start_listening()
-                available_systems.append("Voice Activation")
-            except Exception as e:
-                print(f"Failed to start voice activation: {e}")
-        
-        if self.oled:
-            try:
-                self.oled.update_mode("ACTIVE")
-            except Exception as e:
-                print(f"OLED update error: {e}")
+        if oled:
+            self._safe("OLED update", oled.update_mode, "ACTIVE")
                 
-        print("\n" + "="*60)
-        print("🕷️  HEY SPIDER ROBOT IS NOW ACTIVE!")
-        print("="*60)
-        print("✅ Available Systems:", ", ".join(available_systems) if available_systems else "None")
-        
-        if self.spider:
-            print("🤖 Spider Controller: Ready for commands")
-        else:
-            print("❌ Spider Controller: Not available")
-            
-        print(f"🌐 Web Interface: http://localhost:{settings.WEB_PORT}")
-        
+        # Assemble the whole status banner and write it in one go
+        banner = [
+            _ACTIVE_BANNER,
+            "✅ Available Systems: " + (", ".join(available_systems) if available_systems else "None"),
+            "🤖 Spider Controller: Ready for commands" if spider else "❌ Spider Controller: Not available",
+            f"🌐 Web Interface: http://localhost:{port}"
+        ]
         if available_systems:
-            print("📢 Voice Commands:")
-            print("   - Say 'Hey Spider' followed by a command")
-            print("   - Available commands: walk forward, turn left/right, dance, wave, take photo")
-        
-        print("="*60)
-        print("Press Ctrl+C to stop")
-        print("="*60 + "\n")
+            banner.append(_VOICE_HELP)
+        banner.append(_ACTIVE_FOOTER)
+        logger.info("\n".join(banner))
         
         # Start web interface (this will block)
-        if self.web:
+        if web:
             try:
-                self.web.run(host='0.0.0.0', port=settings.WEB_PORT, debug=False)
+                web.run(host='0.0.0.0', port=port, debug=False)
             except KeyboardInterrupt:
                 self.stop()
             except Exception as e:
-                print(f"Web interface error: {e}")
-                traceback.print_exc()
+                logger.exception("Web interface error: %s", e)
                 self.stop()
         else:
-            print("❌ No web interface available. System will run in console mode.")
+            logger.error("❌ No web interface available. System will run in console mode.")
             try:
-                while self.running:
-                    time.sleep(1)
+                # Block until stop() signals shutdown
+                self._shutdown.wait()
             except KeyboardInterrupt:
                 self.stop()
             
     def stop(self):
         """Stop all robot systems"""
-        print("\n" + "="*50)
-        print("🛑 STOPPING HEY SPIDER ROBOT")
-        print("="*50)
+        logger.info(_STOP_BANNER)
         
         self.running = False
+        self._shutdown.set()
+        oled, spider, vision, ai, voice, web = self.oled, self.spider, self.vision, self.ai, self.voice, self.web
         
-        if self.oled:
-            try:
-                self.oled.update_mode("SHUTDOWN")
-            except Exception as e:
-                print(f"OLED shutdown error: {e}")
-        
-        # Stop subsystems safely
-        if self.voice:
-            try:
-                print("Stopping voice activation...")
-                self.voice.stop_listening()
-            except Exception as e:
-                print(f"Voice shutdown error: {e}")
-        
-        if self.vision:
-            try:
-                print("Stopping visual monitoring...")
-                self.vision.stop_monitoring()
-            except Exception as e:
-                print(f"Vision shutdown error: {e}")
+        if oled:
+            self._safe("OLED shutdown", oled.update_mode, "SHUTDOWN")
         
-        if self.ai:
-            try:
-                print("Stopping AI thinking...")
-                self.ai.stop_thinking()
-            except Exception as e:
-                print(f"AI shutdown error: {e}")
-        
-        if self.oled:
-            try:
-                print("Stopping OLED display...")
-                self.oled.stop()
-            except Exception as e:
-                print(f"OLED stop error: {e}")
-        
-        # Cleanup hardware
-        if self.spider:
-            try:
-                print("Cleaning up hardware...")
-                self.spider.cleanup()
-            except Exception as e:
-                print(f"Hardware cleanup error: {e}")
-        
-        if self.vision:
-            try:
-                self.vision.cleanup()
-            except Exception as e:
-                print(f"Vision cleanup error: {e}")
-        
-        print("="*50)
-        print("✅ Hey Spider Robot stopped safely.")
-        print("="*50)
+        # Stop subsystems safely, then release hardware
+        shutdown_steps = (
+            (web, 'stop', None, "Web shutdown"),
+            (voice, 'stop_listening', "Stopping voice activation...", "Voice shutdown"),
+            (vision, 'stop_monitoring', "Stopping visual monitoring...", "Vision shutdown"),
+            (ai, 'stop_thinking', "Stopping AI thinking...", "AI shutdown"),
+            (ai, 'save_command_cache', None, "AI cache save"),
+            (oled, 'stop', "Stopping OLED display...", "OLED stop"),
+            (spider, 'cleanup', "Cleaning up hardware...", "Hardware cleanup"),
+            (vision, 'cleanup', None, "Vision cleanup"),
+            (background_loop, 'shutdown', None, "Event loop shutdown")
+        )
+        for system, method, message, label in shutdown_steps:
+            if not system:
+                continue
+            if message:
+                logger.info(message)
+            self._safe(label, getattr(system, method))
+            
+        logger.info(_STOPPED_BANNER)
         
+    @staticmethod
+    def _safe(label: str, func, *args) -> bool:
+        """Call func(*args), reporting (not raising) any error; returns success"""
+        try:
+            func(*args)
+            return True
+        except Exception as e:
+            logger.error("%s error: %s", label, e)
+            return False
+            
     def signal_handler(self, signum, frame):
         """Handle system signals"""
-        print(f"\n🛑 Received signal {signum}")
+        logger.info("🛑 Received signal %s", signum)
         self.stop()
         sys.exit(0)
 
+# SIGTERM is only delivered meaningfully on POSIX systems
+HANDLED_SIGNALS = (signal.SIGINT, signal.SIGTERM) if os.name == 'posix' else (signal.SIGINT,)
+
+def _abort_startup(signum, frame):
+    """Signal handler used while subsystems are still initializing"""
+    logger.warning("🛑 Received signal %s during startup, aborting", signum)
+    sys.exit(128 + signum)
+
 def main():
     """Main application entry point with comprehensive error handling"""
-    print("🕷️ HEY SPIDER ROBOT - Starting up...")
-    print("Hardware compatibility: Raspberry Pi with servo/camera/sensor support")
-    print("Software compatibility: Can run with or without hardware (mock mode)")
+    # Handle interrupts cleanly during the (slow) subsystem initialization
+    for signum in HANDLED_SIGNALS:
+        signal.signal(signum, _abort_startup)
+        
+    # getLevelName maps a known level name to its number (getLevelNamesMapping is 3.11+)
+    level_name = os.getenv('SPIDER_LOGLEVEL', 'INFO').strip().upper()
+    level = logging.getLevelName(level_name)
+    logging.basicConfig(level=level if isinstance(level, int) else logging.INFO,
+                        format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    if not isinstance(level, int):
+        logger.warning("Unknown SPIDER_LOGLEVEL %r, using INFO", level_name)
+    
+    logger.info("🕷️ HEY SPIDER ROBOT - Starting up...\n"
+                "Hardware compatibility: Raspberry Pi with servo/camera/sensor support\n"
+                "Software compatibility: Can run with or without hardware (mock mode)")
     
     try:
-        # Check Python version
-        if sys.version_info < (3, 7):
-            print("❌ Python 3.7 or higher is required")
-            sys.exit(1)
-            
         # Check if we're in a virtual environment (recommended)
         if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
-            print("✅ Running in virtual environment")
+            logger.info("✅ Running in virtual environment")
         else:
-            print("⚠️  Not running in virtual environment (recommended)")
+            logger.warning("⚠️  Not running in virtual environment (recommended)")
             
         # Initialize robot
         robot = HeySpiderRobot()
         
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, robot.signal_handler)
-        signal.signal(signal.SIGTERM, robot.signal_handler)
+        # Hand signals over to the robot now that it can shut down properly
+        for signum in HANDLED_SIGNALS:
+            signal.signal(signum, robot.signal_handler)
         
         # Start the robot
         robot.start()
         
     except KeyboardInterrupt:
-        print("\n🛑 Keyboard interrupt received")
+        logger.info("🛑 Keyboard interrupt received")
     except ImportError as e:
-        print(f"❌ Import error: {e}")
-        print("Please install required dependencies with: pip install -r requirements.txt")
+        logger.critical("❌ Import error: %s", e)
+        logger.critical("Please install required dependencies with: pip install -r requirements.txt")
         sys.exit(1)
     except Exception as e:
-        print(f"❌ Fatal error: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Fatal error: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,10 +1,164 @@
-import threading
+import asyncio
+import importlib.util
+import logging
+import os
 import time
 import json
+from collections import OrderedDict
+from pathlib import Path
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
-from openai import OpenAI
 from config.settings import settings
 from src.oled_display import OLEDDisplay
+from src import background_loop
+
+logger = logging.getLogger("spider.ai")
+
+# h2 lets httpx negotiate HTTP/2
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# tiktoken gives exact prompt token counts; without it they are estimated
+TIKTOKEN_AVAILABLE = importlib.util.find_spec('tiktoken') is not None
+
+# msgspec decodes command replies straight into AIResponse; stdlib json otherwise
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+@dataclass(slots=True)
+class AIResponse:
+    """Parsed reply to process_command"""
+    action: str = 'unknown'
+    # Models routinely send null for these; treated the same as leaving them out
+    response: Optional[str] = ''
+    parameters: Optional[Dict[str, Any]] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        if self.response is None:
+            self.response = ''
+        if self.parameters is None:
+            self.parameters = {}
+            
+if MSGSPEC_AVAILABLE:
+    # Typed decode: a wrong-typed or malformed reply raises msgspec.DecodeError
+    parse_ai_response = msgspec.json.Decoder(AIResponse).decode
+    AI_RESPONSE_ERRORS = (msgspec.DecodeError,)
+else:
+    def parse_ai_response(text) -> AIResponse:
+        """Parse a command reply into an AIResponse"""
+        data = json.loads(text)
+        return AIResponse(**{key: data[key] for key in ('action', 'response', 'parameters') if key in data})
+        
+    AI_RESPONSE_ERRORS = (json.JSONDecodeError, TypeError, KeyError)
+
+# One keep-alive connection pool for every OpenAI request in the process
+_http_client: Optional["httpx.AsyncClient"] = None
+
+def shared_http_client() -> "httpx.AsyncClient":
+    """Return the process-wide HTTP client, recreating it if it was closed"""
+    import httpx
+    
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=settings.AI_REQUEST_TIMEOUT
+        )
+    return _http_client
+
+# Fixed instructions for command parsing. Kept as an unchanging system message
+# so the prompt prefix is identical on every call (eligible for server-side
+# prompt caching); only the command itself goes in the user message.
+COMMAND_SYSTEM_PROMPT = """You are a spider robot AI. Parse the user's voice command and return a JSON response.
+
+Available actions: walk_forward, turn_left, turn_right, dance, wave, take_photo, stop
+
+Return JSON like: {"action": "walk_forward", "parameters": {"steps": 3}, "response": "Moving forward!"}
+
+If unclear, return action "unknown" and ask for clarification. Be friendly and spider-like in responses."""
+
+# Same idea for thoughts: the instructions are fixed, the user message carries
+# only the current context fields
+THOUGHT_SYSTEM_PROMPT = """You are a friendly spider robot with personality. Given your current situation, reply with one brief thought or observation for a tiny display: max 50 characters, personality-filled, nothing else."""
+
+# The dynamic part of the thought prompt must stay under this many tokens
+THOUGHT_CONTEXT_MAX_TOKENS = 60
+
+_encoding = None
+
+def _get_encoding():
+    """Return the tiktoken encoding for the configured model, loading it once"""
+    global _encoding
+    if _encoding is None:
+        import tiktoken
+        
+        try:
+            _encoding = tiktoken.encoding_for_model(settings.AI_MODEL)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    """Token count of text, exact with tiktoken or ~4 characters per token without"""
+    if TIKTOKEN_AVAILABLE:
+        return len(_get_encoding().encode(text))
+    return len(text) // 4 + 1
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text down to at most max_tokens tokens"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if TIKTOKEN_AVAILABLE:
+        encoding = _get_encoding()
+        return encoding.decode(encoding.encode(text)[:max_tokens])
+    return text[:max_tokens * 4]
+
+class RateLimiter:
+    """Token bucket for OpenAI requests-per-minute and tokens-per-minute limits"""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.capacity_rpm = float(requests_per_minute)
+        self.capacity_tpm = float(tokens_per_minute)
+        self._requests = self.capacity_rpm
+        self._tokens = self.capacity_tpm
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        
+    def _refill(self):
+        """Top both buckets up for the time elapsed since the last call"""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.capacity_rpm, self._requests + elapsed * self.capacity_rpm / 60)
+        self._tokens = min(self.capacity_tpm, self._tokens + elapsed * self.capacity_tpm / 60)
+        
+    async def acquire(self, tokens: int):
+        """Wait until one request and the given number of tokens are available, then take them"""
+        tokens = min(tokens, self.capacity_tpm)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._requests >= 1 and self._tokens >= tokens:
+                    self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                wait = max((1 - self._requests) * 60 / self.capacity_rpm,
+                           (tokens - self._tokens) * 60 / self.capacity_tpm)
+                await asyncio.sleep(wait)
+                
+# Chat framing adds a few tokens per message on top of its content
+MESSAGE_OVERHEAD_TOKENS = 4
+
+def estimate_tokens(system_tokens: int, user_tokens: int, max_tokens: int) -> int:
+    """Token cost of a system + user chat request: prompt tokens plus the reply budget"""
+    return system_tokens + user_tokens + 2 * MESSAGE_OVERHEAD_TOKENS + max_tokens
+
+def _count_system_prompts():
+    """Token counts of the fixed (thought, command) system prompts"""
+    return count_tokens(THOUGHT_SYSTEM_PROMPT), count_tokens(COMMAND_SYSTEM_PROMPT)
 
 class AIThinking:
     def __init__(self, spider_controller, visual_monitor, oled_display: Optional[OLEDDisplay] = None):
@@ -12,78 +166,157 @@ class AIThinking:
         self.vision = visual_monitor
         self.oled = oled_display
         self.running = False
-        self.think_thread = None
+        self.think_future = None
         self.current_thought = ""
         self.emotional_state = "curious"
         
+        # All OpenAI calls run on the shared background event loop, so a
+        # pending thought never blocks a voice/web command
+        self._request_slots = asyncio.Semaphore(settings.AI_MAX_CONCURRENT_REQUESTS)
+        
+        # Thoughts and commands draw from one budget so bursts never hit 429s
+        self._rate_limiter = RateLimiter(settings.AI_MAX_REQUESTS_PER_MINUTE,
+                                         settings.AI_MAX_TOKENS_PER_MINUTE)
+        
+        # Situation the current thought was generated for, and when
+        self._thought_context_key = None
+        self._thought_time = 0.0
+        
+        # (thought, command) system prompt token counts, counted once off the loop
+        self._system_tokens = None
+        
+        # (model, normalized command) -> (expiry wall time, AI response); the one
+        # command cache for voice and web, persisted to AI_CACHE_PATH across runs
+        self._command_cache = OrderedDict()
+        self._load_command_cache()
+        
         # Initialize OpenAI client with new API
         if settings.OPENAI_API_KEY:
             try:
-                self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
-                print("OpenAI client initialized successfully")
+                # The OpenAI SDK is slow to import; skip it entirely without a key
+                from openai import AsyncOpenAI
+                self.client = AsyncOpenAI(
+                    api_key=settings.OPENAI_API_KEY,
+                    http_client=shared_http_client(),
+                    timeout=settings.AI_REQUEST_TIMEOUT
+                )
+                logger.info("OpenAI client initialized successfully")
             except Exception as e:
-                print(f"OpenAI initialization error: {e}")
+                logger.error("OpenAI initialization error: %s", e)
                 self.client = None
         else:
             self.client = None
-            print("OpenAI API key not set - set OPENAI_API_KEY environment variable")
+            logger.warning("OpenAI API key not set - set OPENAI_API_KEY environment variable")
         
     def start_thinking(self):
-        """Start the AI thinking thread"""
+        """Start the AI thinking task"""
         if not self.client:
-            print("OpenAI client not initialized, AI thinking disabled")
+            logger.warning("OpenAI client not initialized, AI thinking disabled")
             return
             
         self.running = True
-        self.think_thread = threading.Thread(target=self._thinking_loop, daemon=True)
-        self.think_thread.start()
+        self.think_future = background_loop.submit(self._thinking_loop())
         
     def stop_thinking(self):
-        """Stop AI thinking"""
+        """Stop AI thinking and close the OpenAI client"""
         self.running = False
-        if self.think_thread:
-            self.think_thread.join()
+        if self.think_future:
+            self.think_future.cancel()
+            self.think_future = None
+            
+        if self.client:
+            try:
+                background_loop.submit(self.client.close()).result(timeout=5)
+            except Exception as e:
+                logger.error("OpenAI client close error: %s", e)
             
-    def _thinking_loop(self):
+    async def _system_prompt_tokens(self):
+        """(thought, command) system prompt token counts, loading the tokenizer in a thread on first use"""
+        if self._system_tokens is None:
+            self._system_tokens = await asyncio.to_thread(_count_system_prompts)
+        return self._system_tokens
+        
+    async def _thinking_loop(self):
         """Main AI thinking loop"""
+        interval = settings.AI_THINKING_INTERVAL
+        # Warm the tokenizer before the first thought needs it
+        await self._system_prompt_tokens()
         while self.running:
             try:
-                self._generate_thought()
-                time.sleep(settings.AI_THINKING_INTERVAL)
+                # Count the interval from when generation starts, so thoughts come
+                # every max(interval, API latency) rather than interval + latency
+                await asyncio.gather(
+                    asyncio.sleep(interval),
+                    self._generate_thought()
+                )
             except Exception as e:
-                print(f"AI thinking error: {e}")
-                time.sleep(10)
+                logger.exception("AI thinking error: %s", e)
+                await asyncio.sleep(10)
                 
-    def _generate_thought(self):
+    async def _generate_thought(self):
         """Generate an AI thought based on current context"""
         if not self.client:
             return
             
         try:
-            # Gather context
-            context = self._gather_context()
-            
-            # Create prompt
-            prompt = f"""You are a friendly spider robot with personality. Based on your current situation, 
-            generate a brief thought or observation (max 50 characters for display).
+            # Gather context (sensor reads block, so keep them off the loop)
+            context = await asyncio.to_thread(self._gather_context)
             
-            Current context:
-            - What you see: {context['detections_desc']}
-            - Distance to nearest object: {context['distance']:.1f}cm
-            - Current emotional state: {self.emotional_state}
-            - Recent activity: {context['recent_activity']}
-            
-            Respond with just the thought, keep it short and personality-filled."""
+            # Nothing new to think about - keep the current thought instead of
+            # paying for another completion, but refresh it now and then
+            context_key = (context['detections_desc'], int(context['distance'] // 10),
+                           self.emotional_state, context['recent_activity'])
+            now = time.monotonic()
+            if (context_key == self._thought_context_key
+                    and now - self._thought_time < settings.AI_THOUGHT_REFRESH_INTERVAL):
+                return
+                
+            # Only the context changes between calls; a long detection list
+            # is cut so the prompt stays under its token budget
+            prompt = (f"Distance: {context['distance']:.1f}cm\n"
+                      f"Mood: {self.emotional_state}\n"
+                      f"Activity: {context['recent_activity']}\n"
+                      f"Sees: ")
+            detections_budget = THOUGHT_CONTEXT_MAX_TOKENS - 1 - count_tokens(prompt)
+            prompt += truncate_tokens(context['detections_desc'], max(detections_budget, 0))
+            prompt_tokens = count_tokens(prompt)
+            if prompt_tokens >= THOUGHT_CONTEXT_MAX_TOKENS:
+                raise ValueError(f"Thought context is {prompt_tokens} tokens, "
+                                 f"limit is {THOUGHT_CONTEXT_MAX_TOKENS}")
             
-            response = self.client.chat.completions.create(
-                model=settings.AI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=30,
-                temperature=0.8
-            )
+            # Stream the reply so the OLED shows the thought while it is generated
+            thought = ""
+            messages = [
+                {"role": "system", "content": THOUGHT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+            thought_tokens, _ = await self._system_prompt_tokens()
+            await self._rate_limiter.acquire(estimate_tokens(thought_tokens, prompt_tokens, 30))
+            async with self._request_slots:
+                stream = await self.client.chat.completions.create(
+                    model=settings.AI_MODEL,
+                    messages=messages,
+                    max_tokens=30,
+                    temperature=0.8,
+                    stream=True
+                )
+                try:
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if not delta:
+                            continue
+                        thought += delta
+                        if self.oled:
+                            self.oled.update_ai_thought(thought.strip()[:50])
+                        # Anything past 50 characters would be cut off anyway
+                        if len(thought.strip()) >= 50:
+                            break
+                finally:
+                    await stream.response.aclose()
             
-            thought = response.choices[0].message.content.strip()
-            self.current_thought = thought[:50]  # Truncate for display
+            self.current_thought = thought.strip()[:50]  # Truncate for display
+            self._thought_context_key = context_key
+            self._thought_time = now
             
             if self.oled:
                 self.oled.update_ai_thought(self.current_thought)
@@ -91,10 +324,10 @@ class AIThinking:
             # Update emotional state based on context
             self._update_emotional_state(context)
             
-            print(f"AI Thought: {self.current_thought}")
+            logger.info("AI Thought: %s", self.current_thought)
             
         except Exception as e:
-            print(f"Error generating AI thought: {e}")
+            logger.exception("Error generating AI thought: %s", e)
             self.current_thought = "Thinking quietly..."
             if self.oled:
                 self.oled.update_ai_thought(self.current_thought)
@@ -114,7 +347,7 @@ class AIThinking:
                 'is_moving': self.spider.is_moving
             }
         except Exception as e:
-            print(f"Error gathering context: {e}")
+            logger.error("Error gathering context: %s", e)
             return {
                 'detections': [],
                 'detections_desc': "Nothing visible",
@@ -138,37 +371,98 @@ class AIThinking:
             else:
                 self.emotional_state = "curious"
         except Exception as e:
-            print(f"Error updating emotional state: {e}")
+            logger.error("Error updating emotional state: %s", e)
             self.emotional_state = "curious"
             
     def process_command(self, command: str) -> str:
-        """Process voice command using AI"""
+        """Process voice command using AI (blocking wrapper for thread callers)"""
         if not self.client:
             return '{"action": "unknown", "response": "AI not available"}'
             
-        try:
-            prompt = f"""You are a spider robot AI. Parse this voice command and return a JSON response:
-            Command: "{command}"
-            
-            Available actions: walk_forward, turn_left, turn_right, dance, wave, take_photo, stop
-            
-            Return JSON like: {{"action": "walk_forward", "parameters": {{"steps": 3}}, "response": "Moving forward!"}}
+        return background_loop.submit(self.process_command_async(command)).result()
+        
+    async def process_command_async(self, command: str) -> str:
+        """Process voice command using AI"""
+        if not self.client:
+            return '{"action": "unknown", "response": "AI not available"}'
             
-            If unclear, return action "unknown" and ask for clarification. Be friendly and spider-like in responses."""
+        # Repeated commands are answered from the cache
+        command = ' '.join(command.lower().split())
+        key = (settings.AI_MODEL, command)
+        now = time.time()
+        cached = self._command_cache.get(key)
+        if cached is not None:
+            expires, result = cached
+            if now < expires:
+                self._command_cache.move_to_end(key)
+                return result
+            del self._command_cache[key]
             
-            response = self.client.chat.completions.create(
-                model=settings.AI_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=150,
-                temperature=0.7
-            )
+        try:
+            messages = [
+                {"role": "system", "content": COMMAND_SYSTEM_PROMPT},
+                {"role": "user", "content": command}
+            ]
+            _, command_tokens = await self._system_prompt_tokens()
+            await self._rate_limiter.acquire(estimate_tokens(command_tokens, count_tokens(command), 150))
+            async with self._request_slots:
+                response = await self.client.chat.completions.create(
+                    model=settings.AI_MODEL,
+                    messages=messages,
+                    max_tokens=150,
+                    temperature=0.7,
+                    # JSON mode: the reply is always a parseable JSON object
+                    response_format={"type": "json_object"}
+                )
             
-            return response.choices[0].message.content.strip()
+            result = response.choices[0].message.content.strip()
+            # Only remember replies that parse to an action the AI understood
+            try:
+                understood = parse_ai_response(result).action != 'unknown'
+            except AI_RESPONSE_ERRORS:
+                understood = False
+            if understood:
+                self._command_cache[key] = (now + settings.AI_COMMAND_CACHE_TTL, result)
+                if len(self._command_cache) > settings.AI_COMMAND_CACHE_SIZE:
+                    self._command_cache.popitem(last=False)
+            return result
             
         except Exception as e:
-            print(f"Command processing error: {e}")
+            logger.error("Command processing error: %s", e)
             return '{"action": "unknown", "response": "Sorry, I could not process that command."}'
             
+    def _load_command_cache(self):
+        """Warm the command cache from the file written by the last run, skipping expired entries"""
+        path = Path(settings.AI_CACHE_PATH)
+        now = time.time()
+        try:
+            entries = json.loads(path.read_text(encoding='utf-8'))
+            for model, command, result, expires in entries[-settings.AI_COMMAND_CACHE_SIZE:]:
+                if now < expires:
+                    self._command_cache[(model, command)] = (expires, result)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Ignoring unreadable AI cache %s: %s", path, e)
+            self._command_cache.clear()
+            return
+        logger.info("Loaded %d cached AI commands", len(self._command_cache))
+        
+    def save_command_cache(self):
+        """Write the unexpired command cache to disk, oldest entries first"""
+        now = time.time()
+        entries = [[model, command, result, expires]
+                   for (model, command), (expires, result) in self._command_cache.items()
+                   if now < expires]
+        if not entries:
+            return
+        path = Path(settings.AI_CACHE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write a sibling file and swap it in so a crash never leaves half a cache
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(entries), encoding='utf-8')
+        os.replace(tmp_path, path)
+        
     def get_current_thought(self) -> str:
         """Get the current AI thought"""
         return self.current_thought
\ No newline at end of file
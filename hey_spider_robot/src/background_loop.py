@@ -0,0 +1,52 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+
+logger = logging.getLogger("spider.loop")
+
+# One asyncio event loop, in one background thread, shared by every periodic
+# I/O task (OLED refresh, distance polling, AI thinking)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use"""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="spider-io-loop", daemon=True)
+            _thread.start()
+        return _loop
+
+def submit(coro: Coroutine) -> Future:
+    """Schedule a coroutine on the shared loop from any thread"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+async def _cancel_pending():
+    """Cancel every other task on the loop and wait for them to finish"""
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+def shutdown(timeout: float = 5):
+    """Stop the shared loop and wait for its thread to exit"""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None:
+        return
+    
+    try:
+        asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+    except Exception as e:
+        logger.error("Background task shutdown error: %s", e)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout)
+    if not thread.is_alive():
+        loop.close()
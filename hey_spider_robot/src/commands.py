@@ -0,0 +1,51 @@
+import operator
+import re
+from typing import Optional
+
+# Spoken/typed keyword stems and the robot action each one triggers. A word
+# matches a stem it starts with ("walking", "photos", "captured"); stems that
+# change spelling when inflected ("moving", "dancing") are listed as well
+MOVE_WORDS = ('forward', 'walk', 'move', 'moving')
+PHOTO_WORDS = ('photo', 'picture', 'capture', 'capturing')
+KEYWORD_ACTIONS = {
+    **dict.fromkeys(MOVE_WORDS, 'walk_forward'),
+    'left': 'turn_left',
+    'right': 'turn_right',
+    'dance': 'dance',
+    'dancing': 'dance',
+    'wave': 'wave',
+    'waving': 'wave',
+    **dict.fromkeys(PHOTO_WORDS, 'take_photo'),
+    'stop': 'stop'
+}
+
+# When a command names several actions, the earliest in this order wins
+# ("walk left" walks forward), as the original keyword cascade did
+_ACTION_PRIORITY = {action: rank for rank, action in enumerate(dict.fromkeys(KEYWORD_ACTIONS.values()))}
+_KEYWORD_RE = re.compile(r'\b(' + '|'.join(map(re.escape, KEYWORD_ACTIONS)) + ')')
+
+# Robot actions and the subsystem call that performs each one
+SPIDER_ACTIONS = {
+    'walk_forward': operator.methodcaller('walk_forward'),
+    'turn_left': operator.methodcaller('turn_left'),
+    'turn_right': operator.methodcaller('turn_right'),
+    'dance': operator.methodcaller('dance'),
+    'wave': operator.methodcaller('wave')
+}
+VISION_ACTIONS = {
+    'take_photo': operator.methodcaller('capture_photo')
+}
+
+# What to tell the user when a spider action starts
+ACTION_MESSAGES = {
+    'walk_forward': 'Walking forward',
+    'turn_left': 'Turning left',
+    'turn_right': 'Turning right',
+    'dance': 'Dancing!',
+    'wave': 'Waving hello!'
+}
+
+def keyword_action(command: str) -> Optional[str]:
+    """Highest-priority action named by a keyword in a lowercased command, or None"""
+    actions = {KEYWORD_ACTIONS[stem] for stem in _KEYWORD_RE.findall(command)}
+    return min(actions, key=_ACTION_PRIORITY.__getitem__, default=None)
@@ -0,0 +1,47 @@
+import numpy as np
+import torch
+from nvidia.dali import fn, pipeline_def, types
+from nvidia.dali.plugin.pytorch import feed_ndarray
+
+# YOLO letterbox padding colour
+PAD_VALUE = 114
+
+@pipeline_def
+def _letterbox_pipeline(size: int):
+    """BGR frame -> RGB, resize to fit, pad to size x size, scale to 0-1 CHW float"""
+    frames = fn.external_source(name="frames", device="gpu", layout="HWC")
+    frames = fn.color_space_conversion(frames, image_type=types.BGR, output_type=types.RGB)
+    frames = fn.resize(frames, size=[size, size], mode="not_larger")
+    frames = fn.crop(frames, crop=[size, size], out_of_bounds_policy="pad", fill_values=PAD_VALUE)
+    return fn.crop_mirror_normalize(frames, dtype=types.FLOAT, output_layout="CHW",
+                                    mean=[0, 0, 0], std=[255, 255, 255])
+
+class LetterboxPreprocessor:
+    """Prepares camera frames for YOLO on the GPU with NVIDIA DALI"""
+    
+    def __init__(self, size: int, device_id: int = 0):
+        self.size = size
+        self.device = torch.device('cuda', device_id)
+        self.pipe = _letterbox_pipeline(size, batch_size=1, num_threads=2, device_id=device_id)
+        self.pipe.build()
+    
+    def __call__(self, frame) -> torch.Tensor:
+        """Return the frame as a 1x3xSxS CUDA tensor ready for model.predict"""
+        self.pipe.feed_input("frames", [frame])
+        output, = self.pipe.run()
+        dali_tensor = output.as_tensor()
+        tensor = torch.empty(dali_tensor.shape(), dtype=torch.float32, device=self.device)
+        feed_ndarray(dali_tensor, tensor)
+        return tensor
+    
+    def batch(self, frames) -> torch.Tensor:
+        """Return several frames as one Nx3xSxS CUDA tensor"""
+        return torch.cat([self(frame) for frame in frames])
+    
+    def to_frame_coords(self, bboxes: np.ndarray, frame_shape) -> np.ndarray:
+        """Map (N, 4) xyxy boxes from letterboxed model space back to the original frame"""
+        height, width = frame_shape[:2]
+        scale = min(self.size / width, self.size / height)
+        pad_x = (self.size - width * scale) / 2
+        pad_y = (self.size - height * scale) / 2
+        return (bboxes - np.array([pad_x, pad_y, pad_x, pad_y], dtype=bboxes.dtype)) / scale
@@ -1,40 +1,56 @@
+import asyncio
+import importlib.util
+import logging
 import time
-import threading
 from typing import Optional, List
-try:
-    import board
-    import busio
-    import adafruit_ssd1306
-    from PIL import Image, ImageDraw, ImageFont
-    I2C_AVAILABLE = True
-except ImportError as e:
-    print(f"I2C/OLED libraries not available: {e}")
-    I2C_AVAILABLE = False
+
+import numpy as np
+
+logger = logging.getLogger("spider.oled")
+
+# Only check the display libraries are installed here; they (and PIL) are
+# imported when an OLEDDisplay is actually created
+_OLED_MODULES = ('board', 'busio', 'adafruit_ssd1306', 'PIL')
+_missing = [name for name in _OLED_MODULES if importlib.util.find_spec(name) is None]
+I2C_AVAILABLE = not _missing
+if _missing:
+    logger.warning("I2C/OLED libraries not available: missing %s", ', '.join(_missing))
 
 from config.settings import settings
+from src import background_loop
+
+# Rows kept per rendered line (room for descenders) and how many distinct
+# lines are remembered before the cache is reset
+TEXT_BITMAP_HEIGHT = 16
+TEXT_CACHE_SIZE = 64
 
 class OLEDDisplay:
     def __init__(self):
         self.width = settings.OLED_WIDTH
         self.height = settings.OLED_HEIGHT
         self.running = False
-        self.display_thread = None
+        self.display_future = None
         
         # Initialize I2C and display
         if I2C_AVAILABLE:
             try:
+                import board
+                import busio
+                import adafruit_ssd1306
+                from PIL import Image, ImageDraw, ImageFont
+                
                 i2c = busio.I2C(board.SCL, board.SDA)
                 self.display = adafruit_ssd1306.SSD1306_I2C(
                     self.width, self.height, i2c, addr=0x3C
                 )
                 self.display.fill(0)
                 self.display.show()
-                print("OLED display initialized successfully")
+                logger.info("OLED display initialized successfully")
             except Exception as e:
-                print(f"OLED initialization error: {e}")
+                logger.error("OLED initialization error: %s", e)
                 self.display = None
         else:
-            print("OLED display disabled - hardware libraries not available")
+            logger.warning("OLED display disabled - hardware libraries not available")
             self.display = None
             
         # Create image and drawing context if display is available
@@ -47,9 +63,13 @@ class OLEDDisplay:
                 self.font = ImageFont.load_default()
                 self.font_small = ImageFont.load_default()
             except Exception as e:
-                print(f"Font loading error: {e}")
+                logger.error("Font loading error: %s", e)
                 self.font = None
                 self.font_small = None
+                
+            # text -> rendered line; periodic frames are composed from these so
+            # PIL only runs when a line's text actually changes
+            self._text_bitmaps = {}
         
         # Display state
         self.current_status = "Initializing..."
@@ -59,78 +79,115 @@ class OLEDDisplay:
         self.ai_thought = ""
         self.distance = 0
         
+        # State shown by the last frame pushed to the panel
+        self._shown_state = None
+        
     def start(self):
-        """Start the display update thread"""
+        """Start the display update task"""
         if not self.display:
             return
             
         self.running = True
-        self.display_thread = threading.Thread(target=self._update_loop, daemon=True)
-        self.display_thread.start()
+        self.display_future = background_loop.submit(self._update_loop())
         
     def stop(self):
-        """Stop the display update thread"""
+        """Stop the display update task"""
         self.running = False
-        if self.display_thread:
-            self.display_thread.join(timeout=2)
+        if self.display_future:
+            self.display_future.cancel()
+            self.display_future = None
             
-    def _update_loop(self):
+    async def _update_loop(self):
         """Main display update loop"""
+        interval = settings.OLED_UPDATE_INTERVAL
+        update = self._update_display
         while self.running:
             try:
-                self._update_display()
-                time.sleep(settings.OLED_UPDATE_INTERVAL)
+                # Rendering and the I2C push block, so keep them off the event loop
+                await asyncio.to_thread(update)
+                await asyncio.sleep(interval)
             except Exception as e:
-                print(f"Display update error: {e}")
-                time.sleep(1)
+                logger.error("Display update error: %s", e)
+                await asyncio.sleep(1)
                 
+    def _text_bitmap(self, text: str) -> np.ndarray:
+        """Return the cached bitmap of one line of text, rasterizing it with PIL once"""
+        bitmap = self._text_bitmaps.get(text)
+        if bitmap is None:
+            from PIL import Image, ImageDraw
+            
+            if len(self._text_bitmaps) >= TEXT_CACHE_SIZE:
+                self._text_bitmaps.clear()
+            image = Image.new('1', (self.width, TEXT_BITMAP_HEIGHT))
+            ImageDraw.Draw(image).text((0, 0), text, font=self.font, fill=255)
+            bitmap = np.array(image, dtype=bool)
+            self._text_bitmaps[text] = bitmap
+        return bitmap
+        
+    def _blit_text(self, frame: np.ndarray, y: int, text: str):
+        """OR a line of text into a boolean frame at row y"""
+        bitmap = self._text_bitmap(text)
+        h = min(bitmap.shape[0], frame.shape[0] - y)
+        frame[y:y + h] |= bitmap[:h]
+        
     def _update_display(self):
         """Update the OLED display with current information"""
-        if not self.display or not self.draw:
+        if not self.display:
             return
             
         try:
-            # Clear the image
-            self.draw.rectangle((0, 0, self.width, self.height), outline=0, fill=0)
+            # Nothing visible changed - skip the render and the 1KB I2C push
+            state = (self.current_mode, round(self.distance, 1), self.last_command,
+                     len(self.detections), self.ai_thought)
+            if state == self._shown_state:
+                return
+                
+            # Start from a blank frame
+            width, height = self.width, self.height
+            blit = self._blit_text
+            frame = np.zeros((height, width), dtype=bool)
             
             # Line positions
             line_height = 10
             y_pos = 0
             
             # Title
-            self.draw.text((0, y_pos), "HEY SPIDER", font=self.font, fill=255)
+            blit(frame, y_pos, "HEY SPIDER")
             y_pos += line_height + 2
             
             # Status line
-            self.draw.text((0, y_pos), f"Mode: {self.current_mode}", font=self.font_small, fill=255)
+            blit(frame, y_pos, f"Mode: {self.current_mode}")
             y_pos += line_height
             
             # Distance
-            self.draw.text((0, y_pos), f"Dist: {self.distance:.1f}cm", font=self.font_small, fill=255)
+            blit(frame, y_pos, f"Dist: {self.distance:.1f}cm")
             y_pos += line_height
             
             # Last command
             if self.last_command:
                 cmd_display = self.last_command[:15] + "..." if len(self.last_command) > 15 else self.last_command
-                self.draw.text((0, y_pos), f"Cmd: {cmd_display}", font=self.font_small, fill=255)
+                blit(frame, y_pos, f"Cmd: {cmd_display}")
             y_pos += line_height
             
             # Detections
             if self.detections:
                 det_text = f"Sees: {len(self.detections)} objects"
-                self.draw.text((0, y_pos), det_text, font=self.font_small, fill=255)
+                blit(frame, y_pos, det_text)
             y_pos += line_height
             
             # AI thought (truncated)
             if self.ai_thought:
                 thought_display = self.ai_thought[:20] + "..." if len(self.ai_thought) > 20 else self.ai_thought
-                self.draw.text((0, y_pos), thought_display, font=self.font_small, fill=255)
+                blit(frame, y_pos, thought_display)
             
-            # Update the display
-            self.display.image(self.image)
+            # SSD1306 memory is 8-row pages, one byte per column, top row in the
+            # LSB - pack the frame straight into the driver's framebuffer
+            pages = frame.reshape(height // 8, 8, width)
+            self.display.buf[:] = np.packbits(pages, axis=1, bitorder='little').tobytes()
             self.display.show()
+            self._shown_state = state
         except Exception as e:
-            print(f"Display render error: {e}")
+            logger.error("Display render error: %s", e)
         
     def update_status(self, status: str):
         """Update the current status"""
@@ -139,7 +196,7 @@ class OLEDDisplay:
     def update_mode(self, mode: str):
         """Update the current mode"""
         self.current_mode = mode
-        print(f"OLED Mode: {mode}")
+        logger.info("OLED Mode: %s", mode)
         
     def update_command(self, command: str):
         """Update the last command"""
@@ -160,7 +217,7 @@ class OLEDDisplay:
     def show_startup_message(self):
         """Show startup animation"""
         if not self.display or not self.draw:
-            print("OLED Startup: Hey Spider Robot Initializing...")
+            logger.info("OLED Startup: Hey Spider Robot Initializing...")
             return
             
         messages = [
@@ -192,5 +249,5 @@ class OLEDDisplay:
                 self.display.show()
                 time.sleep(0.8)
             except Exception as e:
-                print(f"Startup message error: {e}")
+                logger.error("Startup message error: %s", e)
                 break
\ No newline at end of file
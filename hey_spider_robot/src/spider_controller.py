@@ -1,51 +1,131 @@
+import asyncio
+import importlib.util
+import logging
 import time
-import threading
 import math
 from typing import Dict, List, Optional
 
+import numpy as np
+
+logger = logging.getLogger("spider.controller")
+
 # Hardware imports with fallbacks
 try:
     import RPi.GPIO as GPIO
     GPIO_AVAILABLE = True
 except ImportError:
-    print("RPi.GPIO not available - using mock GPIO")
+    logger.warning("RPi.GPIO not available - using mock GPIO")
     GPIO_AVAILABLE = False
 
+# ServoKit pulls in Blinka and the whole CircuitPython stack; only check it
+# is installed here and import it when the controller is created
+SERVOKIT_AVAILABLE = importlib.util.find_spec('adafruit_servokit') is not None
+if not SERVOKIT_AVAILABLE:
+    logger.warning("ServoKit not available - servo control disabled")
+
 try:
-    from adafruit_servokit import ServoKit
-    SERVOKIT_AVAILABLE = True
+    from smbus2 import SMBus
+    SMBUS2_AVAILABLE = True
 except ImportError:
-    print("ServoKit not available - servo control disabled")
-    SERVOKIT_AVAILABLE = False
+    logger.warning("smbus2 not available - servos will be written one channel at a time")
+    SMBUS2_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.warning("Numba not available - servo trajectories computed with NumPy")
+    NUMBA_AVAILABLE = False
 
 try:
     from gpiozero import DistanceSensor
     GPIOZERO_AVAILABLE = True
 except ImportError:
-    print("gpiozero not available - distance sensor disabled")
+    logger.warning("gpiozero not available - distance sensor disabled")
     GPIOZERO_AVAILABLE = False
 
-from config.hardware_config import SERVO_PINS, ULTRASONIC_PINS
+from config.hardware_config import (SERVO_PIN_ARRAY, ULTRASONIC_PINS, I2C_ADDRESSES,
+                                    Joint, JOINT_OF)
+from config.settings import settings
 from src.oled_display import OLEDDisplay
+from src import background_loop
+
+# PCA9685 channel count and the resting angle of every joint
+SERVO_CHANNELS = 16
+NEUTRAL_ANGLE = 90
+
+# PCA9685 channel driving each Joint
+CHANNEL_OF = np.array(SERVO_PIN_ARRAY, dtype=np.intp)
+
+# PCA9685 registers used for burst writes: MODE1 auto-increment lets one
+# transfer fill consecutive LEDn_ON_L/ON_H/OFF_L/OFF_H registers
+PCA9685_MODE1 = 0x00
+PCA9685_MODE1_AI = 0x20
+PCA9685_LED0_ON_L = 0x06
+I2C_BLOCK_MAX = 32  # SMBus block transfers carry at most 32 data bytes
+
+# Channels 0..N-1 covered by a frame write, and the servo pulse range in
+# 12-bit PWM counts (same 750-2250us defaults as adafruit_motor.servo)
+FRAME_CHANNELS = int(CHANNEL_OF.max()) + 1
+PULSE_MIN_COUNT = 750e-6 * settings.SERVO_FREQUENCY * 4096
+PULSE_MAX_COUNT = 2250e-6 * settings.SERVO_FREQUENCY * 4096
+
+# Longest move is 180 degrees at roughly one degree per tick
+MAX_TRAJECTORY_STEPS = 180
+
+def _smoothstep_trajectory_loops(current, target, out):
+    """Fill out[i] with the angles at tick i+1 of an eased move, clamped to 0-180"""
+    steps = out.shape[0]
+    for i in range(steps):
+        t = (i + 1) / steps
+        ease = t * t * (3.0 - 2.0 * t)
+        for channel in range(current.shape[0]):
+            angle = current[channel] + (target[channel] - current[channel]) * ease
+            out[i, channel] = min(180.0, max(0.0, angle))
+
+def _smoothstep_trajectory_numpy(current, target, out):
+    """Vectorized equivalent of _smoothstep_trajectory_loops"""
+    t = np.arange(1, out.shape[0] + 1, dtype=np.float32) / out.shape[0]
+    ease = t * t * (3.0 - 2.0 * t)
+    np.clip(current + np.outer(ease, target - current), 0, 180, out=out)
+
+# Compiled to machine code when Numba is installed
+smoothstep_trajectory = (njit(cache=True)(_smoothstep_trajectory_loops) if NUMBA_AVAILABLE
+                         else _smoothstep_trajectory_numpy)
 
 class SpiderController:
     def __init__(self, oled_display: Optional[OLEDDisplay] = None):
         self.oled = oled_display
         self.is_moving = False
         self.current_position = "neutral"
+        self.distance_future = None
+        
+        # Latest distance in cm, kept current by the monitoring task
+        self._last_distance = 50.0
+        
+        # Current angle of every servo, indexed by Joint
+        self.servo_angles = np.full(len(Joint), NEUTRAL_ANGLE, dtype=np.float32)
+        
+        # Reused for every move; warming it up also triggers the JIT compile
+        self._trajectory = np.empty((MAX_TRAJECTORY_STEPS, len(Joint)), dtype=np.float32)
+        smoothstep_trajectory(self.servo_angles, self.servo_angles, self._trajectory[:1])
         
         # Initialize servo controller
+        self.bus = None
         if SERVOKIT_AVAILABLE:
             try:
-                self.kit = ServoKit(channels=16, address=0x40, frequency=50)
+                from adafruit_servokit import ServoKit
+                self.kit = ServoKit(channels=SERVO_CHANNELS, address=I2C_ADDRESSES['pca9685'],
+                                    frequency=settings.SERVO_FREQUENCY)
+                self._init_frame_bus()
                 self.setup_servos()
-                print("Servo controller initialized")
+                logger.info("Servo controller initialized")
             except Exception as e:
-                print(f"Servo initialization error: {e}")
+                logger.error("Servo initialization error: %s", e)
                 self.kit = None
         else:
             self.kit = None
-            print("Servo control disabled - ServoKit not available")
+            logger.warning("Servo control disabled - ServoKit not available")
             
         # Initialize ultrasonic sensor
         if GPIOZERO_AVAILABLE:
@@ -55,13 +135,13 @@ class SpiderController:
                     trigger=ULTRASONIC_PINS['trigger'],
                     max_distance=4  # Maximum 4 meters
                 )
-                print("Distance sensor initialized")
+                logger.info("Distance sensor initialized")
             except Exception as e:
-                print(f"Distance sensor error: {e}")
+                logger.error("Distance sensor error: %s", e)
                 self.distance_sensor = None
         else:
             self.distance_sensor = None
-            print("Distance sensor disabled - gpiozero not available")
+            logger.warning("Distance sensor disabled - gpiozero not available")
             
         # Start distance monitoring
         self.start_distance_monitoring()
@@ -69,79 +149,85 @@ class SpiderController:
         if self.oled:
             self.oled.update_mode("READY")
             
+    def _init_frame_bus(self):
+        """Open a raw I2C bus to the PCA9685 for writing all servos per transfer"""
+        if not SMBUS2_AVAILABLE:
+            return
+            
+        try:
+            bus = SMBus(1)
+            address = I2C_ADDRESSES['pca9685']
+            mode1 = bus.read_byte_data(address, PCA9685_MODE1)
+            bus.write_byte_data(address, PCA9685_MODE1, mode1 | PCA9685_MODE1_AI)
+            self.bus = bus
+        except Exception as e:
+            logger.warning("I2C burst writes unavailable, using per-servo writes: %s", e)
+            self.bus = None
+            
+    def _write_frame(self, angles: np.ndarray):
+        """Write per-joint angles to channels 0..FRAME_CHANNELS-1 in block transfers"""
+        counts = np.rint(PULSE_MIN_COUNT + np.clip(angles, 0, 180)
+                         * ((PULSE_MAX_COUNT - PULSE_MIN_COUNT) / 180)).astype(np.uint16)
+        
+        # ON time is always 0, OFF time is the pulse width (little endian);
+        # channels without a joint keep a zero pulse
+        frame = np.zeros((FRAME_CHANNELS, 4), dtype=np.uint8)
+        frame[CHANNEL_OF, 2] = counts & 0xFF
+        frame[CHANNEL_OF, 3] = counts >> 8
+        data = frame.ravel().tolist()
+        
+        address = I2C_ADDRESSES['pca9685']
+        for offset in range(0, len(data), I2C_BLOCK_MAX):
+            self.bus.write_i2c_block_data(address, PCA9685_LED0_ON_L + offset,
+                                          data[offset:offset + I2C_BLOCK_MAX])
+            
     def setup_servos(self):
         """Initialize all servos to neutral position"""
         if not self.kit:
             return
             
-        self.servo_positions = {
-            'leg1_shoulder': 90, 'leg1_elbow': 90, 'leg1_foot': 90,
-            'leg2_shoulder': 90, 'leg2_elbow': 90, 'leg2_foot': 90,
-            'leg3_shoulder': 90, 'leg3_elbow': 90, 'leg3_foot': 90,
-            'leg4_shoulder': 90, 'leg4_elbow': 90, 'leg4_foot': 90
-        }
+        self.servo_angles[:] = NEUTRAL_ANGLE
         
-        for servo_name, position in self.servo_positions.items():
+        for joint in Joint:
             try:
-                if servo_name in SERVO_PINS:
-                    channel = SERVO_PINS[servo_name]
-                    self.kit.servo[channel].angle = position
-                    time.sleep(0.1)
+                self.kit.servo[int(CHANNEL_OF[joint])].angle = NEUTRAL_ANGLE
+                time.sleep(0.1)
             except Exception as e:
-                print(f"Error setting {servo_name}: {e}")
+                logger.error("Error setting %s: %s", joint.name.lower(), e)
                 
     def start_distance_monitoring(self):
         """Start continuous distance monitoring"""
-        def monitor_distance():
-            while True:
-                try:
-                    if self.distance_sensor:
-                        # Get distance in centimeters
-                        distance_m = self.distance_sensor.distance
-                        distance_cm = distance_m * 100 if distance_m and distance_m < 4 else 400
-                        if self.oled:
-                            self.oled.update_distance(distance_cm)
-                    else:
-                        # Mock distance for testing
-                        if self.oled:
-                            self.oled.update_distance(50.0)
-                    time.sleep(0.5)
-                except Exception as e:
-                    print(f"Distance monitoring error: {e}")
-                    time.sleep(2)
-                    
-        threading.Thread(target=monitor_distance, daemon=True).start()
+        self.distance_future = background_loop.submit(self._distance_task())
+        
+    async def _distance_task(self):
+        """Refresh the cached distance and push it to the OLED twice a second"""
+        sensor, oled = self.distance_sensor, self.oled
+        while True:
+            try:
+                if sensor:
+                    # gpiozero measures continuously in its own thread; this only
+                    # blocks until its averaging queue first fills, so keep it off the loop
+                    distance_m = await asyncio.to_thread(lambda: sensor.distance)
+                    self._last_distance = distance_m * 100 if distance_m and distance_m < 4 else 400
+                if oled:
+                    oled.update_distance(self._last_distance)
+                await asyncio.sleep(0.5)
+            except Exception as e:
+                logger.error("Distance monitoring error: %s", e)
+                await asyncio.sleep(2)
         
     def move_servo(self, servo_name: str, angle: int, speed: float = 0.1):
         """Move a single servo to specified angle"""
-        if not self.kit or servo_name not in SERVO_PINS:
-            print(f"Mock servo move: {servo_name} to {angle} degrees")
+        if servo_name not in JOINT_OF:
+            logger.warning("Unknown servo: %s", servo_name)
             return
             
-        try:
-            # Clamp angle to valid range
-            angle = max(0, min(180, angle))
-            
-            channel = SERVO_PINS[servo_name]
-            current_pos = self.servo_positions.get(servo_name, 90)
-            
-            # Smooth movement
-            steps = abs(angle - current_pos)
-            if steps > 0:
-                step_size = 1 if angle > current_pos else -1
-                for pos in range(current_pos, angle + step_size, step_size):
-                    self.kit.servo[channel].angle = pos
-                    time.sleep(speed / max(1, steps / 10))  # Adjusted timing
-                    
-            self.servo_positions[servo_name] = angle
-            
-        except Exception as e:
-            print(f"Error moving servo {servo_name}: {e}")
+        self._adjust_leg_positions({servo_name: angle}, speed)
             
     def walk_forward(self, steps: int = 4):
         """Walk forward using alternating diagonal gait"""
         if self.is_moving:
-            print("Already moving, command ignored")
+            logger.warning("Already moving, command ignored")
             return
             
         self.is_moving = True
@@ -149,7 +235,7 @@ class SpiderController:
             self.oled.update_mode("WALKING")
             
         try:
-            print(f"Walking forward {steps} steps")
+            logger.info("Walking forward %s steps", steps)
             for step in range(steps):
                 # Phase 1: Lift legs 1 and 4, move legs 2 and 3
                 self._lift_legs(['leg1', 'leg4'])
@@ -164,7 +250,7 @@ class SpiderController:
                 time.sleep(0.3)
                 
         except Exception as e:
-            print(f"Walk error: {e}")
+            logger.error("Walk error: %s", e)
         finally:
             self.is_moving = False
             if self.oled:
@@ -180,7 +266,7 @@ class SpiderController:
             self.oled.update_mode("TURNING")
             
         try:
-            print(f"Turning left {steps} steps")
+            logger.info("Turning left %s steps", steps)
             for step in range(steps):
                 self._adjust_leg_positions({
                     'leg1_shoulder': 70, 'leg2_shoulder': 110,
@@ -190,7 +276,7 @@ class SpiderController:
                 self._return_to_neutral()
                 time.sleep(0.3)
         except Exception as e:
-            print(f"Turn left error: {e}")
+            logger.error("Turn left error: %s", e)
         finally:
             self.is_moving = False
             if self.oled:
@@ -206,7 +292,7 @@ class SpiderController:
             self.oled.update_mode("TURNING")
             
         try:
-            print(f"Turning right {steps} steps")
+            logger.info("Turning right %s steps", steps)
             for step in range(steps):
                 self._adjust_leg_positions({
                     'leg1_shoulder': 110, 'leg2_shoulder': 70,
@@ -216,7 +302,7 @@ class SpiderController:
                 self._return_to_neutral()
                 time.sleep(0.3)
         except Exception as e:
-            print(f"Turn right error: {e}")
+            logger.error("Turn right error: %s", e)
         finally:
             self.is_moving = False
             if self.oled:
@@ -232,7 +318,7 @@ class SpiderController:
             self.oled.update_mode("DANCING")
             
         try:
-            print("Dancing!")
+            logger.info("Dancing!")
             dance_moves = [
                 {'leg1_elbow': 45, 'leg3_elbow': 45},
                 {'leg2_elbow': 45, 'leg4_elbow': 45},
@@ -247,7 +333,7 @@ class SpiderController:
                 time.sleep(0.2)
                 
         except Exception as e:
-            print(f"Dance error: {e}")
+            logger.error("Dance error: %s", e)
         finally:
             self.is_moving = False
             if self.oled:
@@ -263,17 +349,15 @@ class SpiderController:
             self.oled.update_mode("WAVING")
             
         try:
-            print("Waving!")
+            logger.info("Waving!")
             for _ in range(3):
-                self.move_servo('leg1_elbow', 45)
-                self.move_servo('leg2_elbow', 45)
+                self._adjust_leg_positions({'leg1_elbow': 45, 'leg2_elbow': 45}, 0.1)
                 time.sleep(0.3)
-                self.move_servo('leg1_elbow', 135)
-                self.move_servo('leg2_elbow', 135)
+                self._adjust_leg_positions({'leg1_elbow': 135, 'leg2_elbow': 135}, 0.1)
                 time.sleep(0.3)
             self._return_to_neutral()
         except Exception as e:
-            print(f"Wave error: {e}")
+            logger.error("Wave error: %s", e)
         finally:
             self.is_moving = False
             if self.oled:
@@ -281,64 +365,93 @@ class SpiderController:
                 
     def _lift_legs(self, legs: List[str]):
         """Lift specified legs"""
-        for leg in legs:
-            self.move_servo(f'{leg}_foot', 45, 0.05)
+        self._adjust_leg_positions({f'{leg}_foot': 45 for leg in legs}, 0.05)
             
     def _lower_legs(self, legs: List[str]):
         """Lower specified legs"""
-        for leg in legs:
-            self.move_servo(f'{leg}_foot', 90, 0.05)
+        self._adjust_leg_positions({f'{leg}_foot': 90 for leg in legs}, 0.05)
             
     def _move_legs_forward(self, legs: List[str]):
         """Move specified legs forward"""
+        positions = {}
         for leg in legs:
-            current = self.servo_positions.get(f'{leg}_shoulder', 90)
-            new_angle = max(60, min(120, current + 20))  # Clamp to safe range
-            self.move_servo(f'{leg}_shoulder', new_angle, 0.05)
+            current = int(self.servo_angles[JOINT_OF[f'{leg}_shoulder']])
+            positions[f'{leg}_shoulder'] = max(60, min(120, current + 20))  # Clamp to safe range
+        self._adjust_leg_positions(positions, 0.05)
             
-    def _adjust_leg_positions(self, positions: Dict[str, int]):
+    def _adjust_leg_positions(self, positions: Dict[str, int], speed: float = 0.02):
         """Adjust multiple leg positions simultaneously"""
-        threads = []
+        target = self.servo_angles.copy()
         for servo_name, angle in positions.items():
-            thread = threading.Thread(
-                target=self.move_servo, 
-                args=(servo_name, angle, 0.02),
-                daemon=True
-            )
-            threads.append(thread)
-            thread.start()
+            target[JOINT_OF[servo_name]] = angle
+        np.clip(target, 0, 180, out=target)
+            
+        if not self.kit:
+            logger.debug("Mock servo move: %s", positions)
+            self.servo_angles[:] = target
+            return
             
-        # Wait for all movements to complete
-        for thread in threads:
-            thread.join()
+        try:
+            self._play_trajectory(target, speed)
+        except Exception as e:
+            logger.error("Error moving servos %s: %s", list(positions), e)
+            
+    def _play_trajectory(self, target: np.ndarray, speed: float):
+        """Step every servo towards target together, easing in and out"""
+        current = self.servo_angles
+        steps = min(int(np.abs(target - current).max()), MAX_TRAJECTORY_STEPS)
+        if steps == 0:
+            return
+            
+        # Row i holds every joint's angle for tick i
+        trajectory = self._trajectory[:steps]
+        smoothstep_trajectory(current, target, trajectory)
+        moving = np.flatnonzero(target != current)
+        tick = speed / max(1, steps / 10)
+        
+        servo = self.kit.servo
+        bus = self.bus
+        next_tick = time.perf_counter()
+        for row in trajectory:
+            if bus:
+                self._write_frame(row)
+            else:
+                for joint in moving:
+                    servo[CHANNEL_OF[joint]].angle = float(row[joint])
+            current[:] = row
+            
+            # Pace against a fixed schedule so write time doesn't add up
+            next_tick += tick
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
         
     def _return_to_neutral(self):
         """Return all servos to neutral position"""
-        neutral_positions = {
-            'leg1_shoulder': 90, 'leg1_elbow': 90, 'leg1_foot': 90,
-            'leg2_shoulder': 90, 'leg2_elbow': 90, 'leg2_foot': 90,
-            'leg3_shoulder': 90, 'leg3_elbow': 90, 'leg3_foot': 90,
-            'leg4_shoulder': 90, 'leg4_elbow': 90, 'leg4_foot': 90
-        }
-        self._adjust_leg_positions(neutral_positions)
+        self._adjust_leg_positions(dict.fromkeys(JOINT_OF, NEUTRAL_ANGLE))
+        
+    @property
+    def servo_positions(self) -> Dict[str, int]:
+        """Current angle of every servo by name (read-only view of servo_angles)"""
+        return {name: int(self.servo_angles[joint]) for name, joint in JOINT_OF.items()}
         
     def get_distance(self) -> float:
-        """Get current distance reading"""
-        try:
-            if self.distance_sensor:
-                distance_m = self.distance_sensor.distance
-                return distance_m * 100 if distance_m and distance_m < 4 else 400
-        except Exception as e:
-            print(f"Distance reading error: {e}")
-        return 50.0  # Return mock distance for testing
+        """Get the latest distance reading (mock 50cm without a sensor)"""
+        return self._last_distance
         
     def cleanup(self):
         """Clean up GPIO resources"""
+        if self.distance_future:
+            self.distance_future.cancel()
+            self.distance_future = None
+            
         try:
             if self.distance_sensor:
                 self.distance_sensor.close()
+            if self.bus:
+                self.bus.close()
             if GPIO_AVAILABLE:
                 GPIO.cleanup()
         except Exception as e:
-            print(f"Cleanup error: {e}")
+            logger.error("Cleanup error: %s", e)
             pass
\ No newline at end of file
@@ -1,63 +1,169 @@
+import logging
+import queue
 import threading
 import time
 import os
+import importlib.util
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Optional
 
+import numpy as np
+
+logger = logging.getLogger("spider.vision")
+
 try:
     import cv2
     OPENCV_AVAILABLE = True
 except ImportError:
-    print("OpenCV not available - camera disabled")
+    logger.warning("OpenCV not available - camera disabled")
     OPENCV_AVAILABLE = False
 
 try:
     from ultralytics import YOLO
     YOLO_AVAILABLE = True
 except ImportError:
-    print("YOLO not available - object detection disabled")
+    logger.warning("YOLO not available - object detection disabled")
     YOLO_AVAILABLE = False
 
+# TensorRT is only present on CUDA machines (Jetson, desktop GPU)
+TENSORRT_AVAILABLE = importlib.util.find_spec('tensorrt') is not None
+
+# NVIDIA DALI moves YOLO's letterbox/normalize preprocessing onto the GPU
+try:
+    DALI_AVAILABLE = importlib.util.find_spec('nvidia.dali') is not None
+except ModuleNotFoundError:
+    DALI_AVAILABLE = False
+
+from config.settings import settings
 from src.oled_display import OLEDDisplay
 
+# GStreamer capture pipelines that convert colour on the hardware scaler
+# instead of the CPU; CAMERA_PIPELINE takes a preset name or a full pipeline
+CAMERA_PIPELINES = {
+    'jetson': ("v4l2src device=/dev/video0 ! video/x-raw,width=640,height=480,framerate=15/1 ! "
+               "nvvidconv ! video/x-raw,format=BGRx ! videoconvert ! video/x-raw,format=BGR ! "
+               "appsink drop=true max-buffers=1"),
+    'vaapi': ("v4l2src device=/dev/video0 ! video/x-raw,width=640,height=480,framerate=15/1 ! "
+              "vaapipostproc format=bgrx ! videoconvert ! video/x-raw,format=BGR ! "
+              "appsink drop=true max-buffers=1"),
+}
+
+# Mock detections: classes and the x1, y1, x2, y2 ranges (high is exclusive)
+MOCK_OBJECTS = np.array(['person', 'chair', 'laptop', 'cup', 'book', 'phone'])
+MOCK_BBOX_LOW = (50, 50, 350, 250)
+MOCK_BBOX_HIGH = (301, 201, 591, 431)
+
+@dataclass(frozen=True, slots=True)
+class Detections:
+    """Detection results as parallel arrays, one row per object"""
+    classes: np.ndarray       # class names
+    confidences: np.ndarray   # (N,)
+    bboxes: np.ndarray        # (N, 4) x1, y1, x2, y2
+    _dicts: Optional[List[Dict]] = field(default=None, init=False, repr=False, compare=False)
+    _columns: Optional[Dict[str, List]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __len__(self) -> int:
+        return len(self.confidences)
+        
+    def as_dicts(self) -> List[Dict]:
+        """The detections as {'class', 'confidence', 'bbox'} dicts, built once for JSON consumers"""
+        if self._dicts is None:
+            object.__setattr__(self, '_dicts', [
+                {'class': obj_class, 'confidence': confidence, 'bbox': bbox}
+                for obj_class, confidence, bbox in zip(self.classes.tolist(), self.confidences.tolist(),
+                                                      self.bboxes.tolist())
+            ])
+        return self._dicts
+        
+    def as_columns(self) -> Dict[str, List]:
+        """Class names and confidences as two parallel lists, built once for the dashboard"""
+        if self._columns is None:
+            object.__setattr__(self, '_columns', {
+                'classes': self.classes.tolist(),
+                # Rounded in float64 so the JSON carries 0.912, not 0.9120000004768372
+                'confidences': np.round(self.confidences.astype(np.float64), 3).tolist()
+            })
+        return self._columns
+        
+    def class_counts(self):
+        """(class, count) pairs in order of first appearance"""
+        names, first_index, counts = np.unique(self.classes, return_index=True, return_counts=True)
+        order = np.argsort(first_index)
+        return zip(names[order].tolist(), counts[order].tolist())
+        
+NO_DETECTIONS = Detections(np.array([], dtype=str), np.empty(0, dtype=np.float32),
+                           np.empty((0, 4), dtype=np.float32))
+
 class VisualMonitor:
+    # Read-only test image, built once and shared when no camera is available
+    _mock_frame_template = None
+    
     def __init__(self, oled_display: Optional[OLEDDisplay] = None):
         self.oled = oled_display
         self.camera = None
         self.model = None
+        self.preprocess = None
         self.running = False
         self.capture_thread = None
-        self.latest_detections = []
+        self.detection_thread = None
+        # Hand-off from capture to detection: holds at most the newest batch
+        self._pending_batch = queue.Queue(maxsize=1)
+        self.detections = NO_DETECTIONS
         self.latest_frame = None
+        # Notified whenever latest_frame is replaced, for consumers that wait on frames
+        self._frame_ready = threading.Condition()
+        self._rng = np.random.default_rng()
+        # Small grayscale copy of the last frame YOLO saw, for motion gating
+        self._motion_reference = None
+        self._static_skips = 0
+        # (detections, their description): rebuilt only when the detections are replaced
+        self._description_cache = (None, "")
         
         # Initialize camera
         if OPENCV_AVAILABLE:
             try:
-                self.camera = cv2.VideoCapture(0)
+                self.camera = self._open_camera()
                 if self.camera.isOpened():
                     self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
                     self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
                     self.camera.set(cv2.CAP_PROP_FPS, 15)
-                    print("Camera initialized successfully")
+                    # Keep only the newest frame in the driver, so reads are never stale
+                    self.camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                    logger.info("Camera initialized successfully")
                 else:
-                    print("Camera not available")
+                    logger.warning("Camera not available")
                     self.camera = None
             except Exception as e:
-                print(f"Camera initialization error: {e}")
+                logger.error("Camera initialization error: %s", e)
                 self.camera = None
         else:
-            print("Camera disabled - OpenCV not available")
+            logger.warning("Camera disabled - OpenCV not available")
             
         # Initialize YOLO model
         if YOLO_AVAILABLE:
             try:
-                self.model = YOLO('yolov8n.pt')
-                print("YOLO model loaded successfully")
+                self.model = self._load_model()
+                # Class id -> name as an array, so ids map to names in one indexing op
+                names = self.model.names
+                self._class_names = np.array([names[class_id] for class_id in sorted(names)])
+                logger.info("YOLO model loaded successfully")
             except Exception as e:
-                print(f"YOLO model loading error: {e}")
+                logger.error("YOLO model loading error: %s", e)
                 self.model = None
         else:
-            print("Object detection disabled - YOLO not available")
+            logger.warning("Object detection disabled - YOLO not available")
+            
+        # GPU preprocessing (needs DALI and a CUDA device)
+        if self.model and settings.YOLO_GPU_PREPROCESS and DALI_AVAILABLE:
+            try:
+                from src.gpu_preprocess import LetterboxPreprocessor
+                self.preprocess = LetterboxPreprocessor(settings.YOLO_IMAGE_SIZE)
+                logger.info("GPU preprocessing enabled (DALI)")
+            except Exception as e:
+                logger.warning("GPU preprocessing unavailable: %s", e)
+                self.preprocess = None
             
         # Create images directory
         os.makedirs('images', exist_ok=True)
@@ -66,54 +172,113 @@ class VisualMonitor:
         if not self.camera:
             self._generate_mock_frame()
         
+    def _open_camera(self):
+        """Open the GStreamer pipeline if one is configured, else the default V4L2 camera"""
+        pipeline = CAMERA_PIPELINES.get(settings.CAMERA_PIPELINE, settings.CAMERA_PIPELINE)
+        if pipeline:
+            camera = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+            if camera.isOpened():
+                logger.info("Camera opened through GStreamer")
+                return camera
+            logger.warning("GStreamer pipeline failed to open, falling back to V4L2")
+        return cv2.VideoCapture(0)
+        
+    def _load_model(self):
+        """Load YOLO, preferring a TensorRT FP16 engine exported once and cached next to the weights"""
+        weights = settings.YOLO_MODEL
+        if not (settings.YOLO_TENSORRT and TENSORRT_AVAILABLE):
+            return YOLO(weights)
+            
+        engine = os.path.splitext(weights)[0] + '.engine'
+        if not os.path.exists(engine):
+            try:
+                logger.info("Exporting YOLO to TensorRT (one-time, takes a few minutes)...")
+                exported = YOLO(weights).export(format='engine', half=True, imgsz=settings.YOLO_IMAGE_SIZE, device=0,
+                                                dynamic=True, batch=settings.YOLO_BATCH_SIZE, workspace=2)
+                if os.path.abspath(exported) != os.path.abspath(engine):
+                    os.replace(exported, engine)
+            except Exception as e:
+                logger.warning("TensorRT export failed, using PyTorch weights: %s", e)
+                return YOLO(weights)
+                
+        logger.info("Using TensorRT engine: %s", engine)
+        return YOLO(engine, task='detect')
+        
     def _generate_mock_frame(self):
         """Generate a mock frame for testing when camera is not available"""
         try:
-            import numpy as np
-            # Create a simple test image
-            self.latest_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-            self.latest_frame[100:380, 100:540] = [64, 64, 128]  # Dark blue rectangle
-            # Add some text
-            if OPENCV_AVAILABLE:
-                cv2.putText(self.latest_frame, "MOCK CAMERA", (200, 240), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            template = VisualMonitor._mock_frame_template
+            if template is None:
+                # Create a simple test image
+                template = np.zeros((480, 640, 3), dtype=np.uint8)
+                template[100:380, 100:540] = [64, 64, 128]  # Dark blue rectangle
+                # Add some text
+                if OPENCV_AVAILABLE:
+                    cv2.putText(template, "MOCK CAMERA", (200, 240), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+                # Consumers only read frames; anything that draws must copy first
+                template.setflags(write=False)
+                VisualMonitor._mock_frame_template = template
+            self.latest_frame = template
         except:
             self.latest_frame = None
         
     def start_monitoring(self):
-        """Start the visual monitoring thread"""
+        """Start the capture and detection threads"""
         self.running = True
         self.capture_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
         self.capture_thread.start()
-        print("Visual monitoring started")
+        self.detection_thread = threading.Thread(target=self._detection_loop, daemon=True)
+        self.detection_thread.start()
+        logger.info("Visual monitoring started")
         
     def stop_monitoring(self):
         """Stop visual monitoring"""
         self.running = False
         if self.capture_thread:
             self.capture_thread.join(timeout=2)
+        if self.detection_thread:
+            self.detection_thread.join(timeout=2)
             
     def _monitoring_loop(self):
-        """Main monitoring loop"""
+        """Capture loop: keeps latest_frame fresh and hands batches to the detection thread"""
         last_capture = 0
         frame_count = 0
         
+        # Frames sampled evenly across the capture interval, detected as one batch
+        batch = deque(maxlen=settings.YOLO_BATCH_SIZE)
+        sample_every = max(1, int(settings.AUTO_CAPTURE_INTERVAL / 0.1) // settings.YOLO_BATCH_SIZE)
+        
         while self.running:
             try:
                 if self.camera and self.camera.isOpened():
-                    # Capture frame from camera
+                    # Every read gets a fresh array; published frames are read-only,
+                    # so whoever holds one (stream, batch, photo) sees it unchanged
                     ret, frame = self.camera.read()
                     if ret:
-                        self.latest_frame = frame
+                        frame.setflags(write=False)
+                        with self._frame_ready:
+                            self.latest_frame = frame
+                            self._frame_ready.notify_all()
+                        if frame_count % sample_every == 0:
+                            batch.append(frame)
                         frame_count += 1
                         
-                        # Auto-capture and analyze every interval
+                        # Auto-capture and analyze every interval, without waiting
+                        # for YOLO; a batch still pending is stale, so replace it
                         current_time = time.time()
-                        if current_time - last_capture >= 30:  # 30 seconds
-                            self._process_frame(frame)
+                        if current_time - last_capture >= settings.AUTO_CAPTURE_INTERVAL:
+                            if not batch or batch[-1] is not frame:
+                                batch.append(frame)
+                            try:
+                                self._pending_batch.get_nowait()
+                            except queue.Empty:
+                                pass
+                            self._pending_batch.put(list(batch))
+                            batch.clear()
                             last_capture = current_time
                     else:
-                        print("Failed to capture frame")
+                        logger.warning("Failed to capture frame")
                         time.sleep(1)
                 else:
                     # Use mock frame when camera not available
@@ -124,42 +289,63 @@ class VisualMonitor:
                 time.sleep(0.1)  # ~10 FPS
                 
             except Exception as e:
-                print(f"Monitoring error: {e}")
+                logger.exception("Monitoring error: %s", e)
                 time.sleep(1)
                 
+    def _detection_loop(self):
+        """Detection loop: runs YOLO on each batch the capture loop hands over"""
+        while self.running:
+            try:
+                frames = self._pending_batch.get(timeout=1)
+            except queue.Empty:
+                continue
+                
+            try:
+                if self._scene_changed(frames[-1]):
+                    self._process_frames(frames)
+            except Exception as e:
+                logger.exception("Detection error: %s", e)
+                time.sleep(1)
+                
+    def _scene_changed(self, frame) -> bool:
+        """Cheap motion gate: has the scene changed since YOLO last looked at it?"""
+        small = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (160, 120), interpolation=cv2.INTER_AREA)
+        small = cv2.GaussianBlur(small, (5, 5), 0)  # Ignore sensor noise
+        reference = self._motion_reference
+        if reference is not None and self._static_skips < settings.MOTION_MAX_SKIPS:
+            changed = np.count_nonzero(cv2.absdiff(small, reference) > 25)
+            if changed < small.size * settings.MOTION_MIN_CHANGED:
+                self._static_skips += 1
+                return False
+                
+        self._motion_reference = small
+        self._static_skips = 0
+        return True
+        
     def _generate_mock_detections(self):
         """Generate mock detections for testing"""
-        import random
-        mock_objects = ['person', 'chair', 'laptop', 'cup', 'book', 'phone']
+        rng = self._rng
         
-        # Randomly generate 0-3 detections
-        num_detections = random.randint(0, 3)
-        detections = []
+        # Randomly generate 0-3 detections, all fields drawn in one call each
+        num_detections = int(rng.integers(0, 4))
+        classes = rng.choice(MOCK_OBJECTS, num_detections)
+        confidences = rng.uniform(0.6, 0.95, num_detections)
+        bboxes = rng.integers(MOCK_BBOX_LOW, MOCK_BBOX_HIGH, (num_detections, 4))
         
-        for _ in range(num_detections):
-            obj_class = random.choice(mock_objects)
-            confidence = random.uniform(0.6, 0.95)
-            bbox = [
-                random.randint(50, 300),  # x1
-                random.randint(50, 200),  # y1
-                random.randint(350, 590), # x2
-                random.randint(250, 430)  # y2
-            ]
-            
-            detections.append({
-                'class': obj_class,
-                'confidence': confidence,
-                'bbox': bbox
-            })
-            
-        self.latest_detections = detections
+        detections = Detections(classes, confidences, bboxes)
+        
+        self.detections = detections
         if self.oled:
-            self.oled.update_detections(detections)
+            self.oled.update_detections(detections.as_dicts())
             
-        print(f"Mock detections: {len(detections)} objects")
+        logger.debug("Mock detections: %s objects", len(detections))
         
     def _process_frame(self, frame):
         """Process frame for object detection"""
+        return self._process_frames([frame])
+        
+    def _process_frames(self, frames):
+        """Run object detection on a batch of frames in one model call"""
         if not self.model:
             self._generate_mock_detections()
             return self.latest_detections
@@ -168,45 +354,59 @@ class VisualMonitor:
             if self.oled:
                 self.oled.update_mode("ANALYZING")
                 
-            # Run YOLO detection
-            results = self.model(frame, verbose=False)
+            # Run YOLO detection, letterboxing on the GPU when DALI is set up; the
+            # confidence threshold is applied in the model's own postprocess (NMS)
+            threshold = settings.CONFIDENCE_THRESHOLD
+            if self.preprocess:
+                results = self.model.predict(self.preprocess.batch(frames), verbose=False, conf=threshold)
+            else:
+                results = self.model(frames, verbose=False, conf=threshold)
             
-            detections = []
-            for result in results:
-                if hasattr(result, 'boxes') and result.boxes is not None:
-                    for box in result.boxes:
-                        if box.conf[0] > 0.5:  # Confidence threshold
-                            class_id = int(box.cls[0])
-                            class_name = self.model.names[class_id]
-                            confidence = float(box.conf[0])
-                            
-                            detections.append({
-                                'class': class_name,
-                                'confidence': confidence,
-                                'bbox': box.xyxy[0].tolist()
-                            })
-                        
-            self.latest_detections = detections
+            # Keep the frame that saw the most, so one frame missing an
+            # object does not drop it; ties go to the most recent frame
+            best_index, best_detections = 0, NO_DETECTIONS
+            for index, (frame, result) in enumerate(zip(frames, results)):
+                boxes = getattr(result, 'boxes', None)
+                if boxes is None:
+                    continue
+                    
+                # Whole result tensors, one device->host copy each, instead of
+                # three scalar fetches per box
+                confidences = boxes.conf.cpu().numpy()
+                class_ids = boxes.cls.cpu().numpy().astype(np.intp)
+                bboxes = boxes.xyxy.cpu().numpy()
+                if self.preprocess:
+                    bboxes = self.preprocess.to_frame_coords(bboxes, frame.shape)
+                    
+                detections = Detections(self._class_names[class_ids], confidences, bboxes)
+                if len(detections) >= len(best_detections):
+                    best_index, best_detections = index, detections
+                    
+            detections = best_detections
+            self.detections = detections
             
             if self.oled:
-                self.oled.update_detections(detections)
+                self.oled.update_detections(detections.as_dicts())
                 self.oled.update_mode("READY")
                 
             # Save annotated image if detections found
-            if detections and OPENCV_AVAILABLE:
+            if len(detections) and OPENCV_AVAILABLE:
                 try:
-                    annotated_frame = results[0].plot()
+                    annotated_frame = results[best_index].plot()
+                    if self.preprocess:
+                        # Plotted on the letterboxed RGB model input
+                        annotated_frame = cv2.cvtColor(annotated_frame, cv2.COLOR_RGB2BGR)
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     filename = f"images/detection_{timestamp}.jpg"
                     cv2.imwrite(filename, annotated_frame)
-                    print(f"Saved detection image: {filename}")
+                    logger.info("Saved detection image: %s", filename)
                 except Exception as e:
-                    print(f"Error saving annotated image: {e}")
+                    logger.error("Error saving annotated image: %s", e)
                 
-            return detections
+            return detections.as_dicts()
             
         except Exception as e:
-            print(f"Frame processing error: {e}")
+            logger.exception("Frame processing error: %s", e)
             if self.oled:
                 self.oled.update_mode("ERROR")
             return []
@@ -225,43 +425,54 @@ class VisualMonitor:
                 if OPENCV_AVAILABLE:
                     success = cv2.imwrite(filename, frame_to_save)
                     if success:
-                        print(f"Photo saved: {filename}")
+                        logger.info("Photo saved: %s", filename)
                         
                         # Also run detection on manual capture
                         detections = self._process_frame(frame_to_save)
                         return filename
                     else:
-                        print("Failed to save photo")
+                        logger.warning("Failed to save photo")
                         return ""
                 else:
-                    print("Photo capture unavailable - OpenCV not available")
+                    logger.warning("Photo capture unavailable - OpenCV not available")
                     return ""
             else:
-                print("No frame available for capture")
+                logger.warning("No frame available for capture")
                 return ""
                 
         except Exception as e:
-            print(f"Photo capture error: {e}")
+            logger.exception("Photo capture error: %s", e)
             return ""
             
     def get_latest_detections(self) -> List[Dict]:
         """Get the latest detection results"""
         return self.latest_detections.copy()
         
+    @property
+    def latest_detections(self) -> List[Dict]:
+        """Latest detections as dicts (shared; copy before modifying)"""
+        return self.detections.as_dicts()
+        
     def get_detection_description(self) -> str:
         """Get natural language description of detections"""
-        if not self.latest_detections:
-            return "I don't see anything interesting."
+        detections = self.detections
+        cached_detections, description = self._description_cache
+        if detections is cached_detections:
+            return description
             
-        # Count objects by class
-        object_counts = {}
-        for detection in self.latest_detections:
-            class_name = detection['class']
-            object_counts[class_name] = object_counts.get(class_name, 0) + 1
+        description = self._describe(detections)
+        self._description_cache = (detections, description)
+        return description
+        
+    @staticmethod
+    def _describe(detections: Detections) -> str:
+        """Build the natural language description of a detection set"""
+        if not len(detections):
+            return "I don't see anything interesting."
             
-        # Create description
+        # Create description, counting objects by class in one vectorized pass
         descriptions = []
-        for obj_class, count in object_counts.items():
+        for obj_class, count in detections.class_counts():
             if count == 1:
                 descriptions.append(f"1 {obj_class}")
             else:
@@ -278,8 +489,14 @@ class VisualMonitor:
         """Get the latest camera frame"""
         return self.latest_frame
         
+    def wait_for_frame(self, previous=None, timeout: float = 1.0):
+        """Return the latest frame once it is not previous, or the current one after timeout"""
+        with self._frame_ready:
+            self._frame_ready.wait_for(lambda: self.latest_frame is not previous, timeout)
+            return self.latest_frame
+            
     def cleanup(self):
         """Clean up camera resources"""
         if self.camera and self.camera.isOpened():
             self.camera.release()
-            print("Camera resources cleaned up")
\ No newline at end of file
+            logger.info("Camera resources cleaned up")
\ No newline at end of file
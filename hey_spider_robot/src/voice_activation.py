@@ -1,21 +1,32 @@
+import logging
+import re
 import threading
 import time
+from array import array
 from typing import Optional, Callable
 
+logger = logging.getLogger("spider.voice")
+
 try:
     import speech_recognition as sr
     SPEECH_RECOGNITION_AVAILABLE = True
 except ImportError:
-    print("SpeechRecognition not available - voice commands disabled")
+    logger.warning("SpeechRecognition not available - voice commands disabled")
     SPEECH_RECOGNITION_AVAILABLE = False
 
 try:
     import pyaudio
     PYAUDIO_AVAILABLE = True
 except ImportError:
-    print("PyAudio not available - microphone disabled")
+    logger.warning("PyAudio not available - microphone disabled")
     PYAUDIO_AVAILABLE = False
 
+try:
+    import pvporcupine
+    PORCUPINE_AVAILABLE = True
+except ImportError:
+    PORCUPINE_AVAILABLE = False
+
 from config.settings import settings
 from src.oled_display import OLEDDisplay
 
@@ -28,6 +39,11 @@ class VoiceActivation:
         self.microphone = None
         self.listening = False
         self.listen_thread = None
+        self.kws = None
+        
+        # Wake phrase as a whole-word match, capturing the command spoken after it
+        wake_words = r'\s+'.join(map(re.escape, settings.WAKE_PHRASE.split()))
+        self._wake_re = re.compile(rf'\b{wake_words}\b\W*(.*)', re.IGNORECASE | re.DOTALL)
         
         # Initialize speech recognition components
         if SPEECH_RECOGNITION_AVAILABLE and PYAUDIO_AVAILABLE:
@@ -37,26 +53,38 @@ class VoiceActivation:
                 
                 # Adjust for ambient noise
                 with self.microphone as source:
-                    print("Adjusting for ambient noise... Please wait.")
+                    logger.info("Adjusting for ambient noise... Please wait.")
                     self.recognizer.adjust_for_ambient_noise(source, duration=2)
-                    print("Voice system initialized")
+                    logger.info("Voice system initialized")
                     
             except Exception as e:
-                print(f"Microphone initialization error: {e}")
+                logger.error("Microphone initialization error: %s", e)
                 self.recognizer = None
                 self.microphone = None
         else:
-            print("Voice recognition disabled - required libraries not available")
+            logger.warning("Voice recognition disabled - required libraries not available")
+            
+        # Local wake word spotting, so only speech after the wake word goes to Google
+        if (self.microphone and PORCUPINE_AVAILABLE
+                and settings.PORCUPINE_ACCESS_KEY and settings.PORCUPINE_KEYWORD_PATH):
+            try:
+                self.kws = pvporcupine.create(access_key=settings.PORCUPINE_ACCESS_KEY,
+                                              keyword_paths=[settings.PORCUPINE_KEYWORD_PATH])
+                logger.info("On-device wake word detection enabled (Porcupine)")
+            except Exception as e:
+                logger.error("Porcupine initialization error: %s", e)
+                self.kws = None
             
     def start_listening(self):
         """Start the voice recognition thread"""
         if not self.recognizer or not self.microphone:
-            print("Voice system not available - using mock voice commands")
+            logger.warning("Voice system not available - using mock voice commands")
             self._start_mock_voice()
             return
             
         self.listening = True
-        self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
+        target = self._keyword_loop if self.kws else self._listen_loop
+        self.listen_thread = threading.Thread(target=target, daemon=True)
         self.listen_thread.start()
         
         if self.oled:
@@ -70,7 +98,7 @@ class VoiceActivation:
             for cmd in mock_cmds:
                 if not self.listening:
                     break
-                print(f"Mock voice command: {cmd}")
+                logger.info("Mock voice command: %s", cmd)
                 if self.oled:
                     self.oled.update_command(cmd)
                 self.command_callback(cmd)
@@ -84,19 +112,59 @@ class VoiceActivation:
         self.listening = False
         if self.listen_thread:
             self.listen_thread.join(timeout=2)
+        if self.kws and not (self.listen_thread and self.listen_thread.is_alive()):
+            self.kws.delete()
+            self.kws = None
             
     def _listen_loop(self):
         """Main listening loop"""
-        print("Voice recognition started - say 'Hey Spider' to activate")
+        logger.info("Voice recognition started - say 'Hey Spider' to activate")
         
         while self.listening:
             try:
                 self._listen_for_wake_phrase()
                 time.sleep(0.1)
             except Exception as e:
-                print(f"Listening error: {e}")
+                logger.error("Listening error: %s", e)
                 time.sleep(1)
                 
+    def _keyword_loop(self):
+        """Listening loop that spots the wake word on-device from raw microphone PCM"""
+        logger.info("Voice recognition started (on-device wake word) - say 'Hey Spider' to activate")
+        kws = self.kws
+        audio = pyaudio.PyAudio()
+        open_stream = lambda: audio.open(rate=kws.sample_rate, channels=1, format=pyaudio.paInt16,
+                                         input=True, frames_per_buffer=kws.frame_length)
+        stream = None
+        try:
+            while self.listening:
+                try:
+                    if stream is None:
+                        stream = open_stream()
+                    pcm = array('h', stream.read(kws.frame_length, exception_on_overflow=False))
+                    if kws.process(pcm) < 0:
+                        continue
+                        
+                    # Close the Porcupine stream so sr.Microphone can open the device
+                    # for the command, then reopen it whatever the command outcome
+                    stream.close()
+                    stream = None
+                    try:
+                        logger.info("Wake phrase detected, waiting for command...")
+                        if self.oled:
+                            self.oled.update_status("Say command...")
+                        self._wait_for_command()
+                    finally:
+                        if self.listening:
+                            stream = open_stream()
+                except Exception as e:
+                    logger.error("Listening error: %s", e)
+                    time.sleep(1)
+        finally:
+            if stream is not None:
+                stream.close()
+            audio.terminate()
+            
     def _listen_for_wake_phrase(self):
         """Listen for the wake phrase and commands"""
         try:
@@ -117,20 +185,19 @@ class VoiceActivation:
             if self.oled:
                 self.oled.update_status("Heard: " + text[:15])
                 
-            # Check for wake phrase
-            if settings.WAKE_PHRASE in text:
-                # Extract command after wake phrase
-                wake_index = text.find(settings.WAKE_PHRASE)
-                command = text[wake_index + len(settings.WAKE_PHRASE):].strip()
+            # Check for wake phrase and extract the command after it in one scan
+            match = self._wake_re.search(text)
+            if match:
+                command = match.group(1).strip()
                 
                 if command:
-                    print(f"Voice command received: {command}")
+                    logger.info("Voice command received: %s", command)
                     if self.oled:
                         self.oled.update_command(command)
                         self.oled.update_mode("PROCESSING")
                     self.command_callback(command)
                 else:
-                    print("Wake phrase detected, waiting for command...")
+                    logger.info("Wake phrase detected, waiting for command...")
                     if self.oled:
                         self.oled.update_status("Say command...")
                     self._wait_for_command()
@@ -140,17 +207,17 @@ class VoiceActivation:
         except sr.UnknownValueError:
             pass  # Could not understand audio
         except sr.RequestError as e:
-            print(f"Speech recognition service error: {e}")
+            logger.error("Speech recognition service error: %s", e)
             time.sleep(5)
         except Exception as e:
-            print(f"Unexpected voice error: {e}")
+            logger.exception("Unexpected voice error: %s", e)
             time.sleep(2)
             
     def _wait_for_command(self):
         """Wait for command after wake phrase detected"""
         try:
             with self.microphone as source:
-                print("Listening for command...")
+                logger.debug("Listening for command...")
                 audio = self.recognizer.listen(source, timeout=settings.VOICE_TIMEOUT, phrase_time_limit=5)
                 
             try:
@@ -162,22 +229,22 @@ class VoiceActivation:
                     command = ""
                     
             if command:
-                print(f"Command: {command}")
+                logger.info("Command: %s", command)
                 if self.oled:
                     self.oled.update_command(command)
                     self.oled.update_mode("PROCESSING")
                 self.command_callback(command)
             else:
-                print("No command understood")
+                logger.warning("No command understood")
                 if self.oled:
                     self.oled.update_status("Command not understood")
                 
         except sr.WaitTimeoutError:
-            print("No command received within timeout")
+            logger.warning("No command received within timeout")
             if self.oled:
                 self.oled.update_status("Command timeout")
         except Exception as e:
-            print(f"Command listening error: {e}")
+            logger.error("Command listening error: %s", e)
         finally:
             if self.oled:
                 self.oled.update_mode("LISTENING")
\ No newline at end of file
@@ -1,19 +1,97 @@
-import base64
+import gzip
 import json
+import logging
 import threading
 import time
-import traceback
+from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
+
 try:
     import cv2
     OPENCV_AVAILABLE = True
 except ImportError:
     OPENCV_AVAILABLE = False
 
-from flask import Flask, render_template_string, jsonify, request
+# orjson serializes API responses several times faster than Flask's stdlib jsonify
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# libjpeg-turbo's SIMD encoder is several times faster than cv2.imencode
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# msgspec decodes /api/command bodies straight into CommandRequest
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+from flask import Flask, Response, render_template_string, jsonify, request
 from flask_socketio import SocketIO, emit
+from config.settings import settings
 from src.oled_display import OLEDDisplay
+from src.visual_monitor import NO_DETECTIONS
+from src.ai_thinking import parse_ai_response, AI_RESPONSE_ERRORS
+from src.commands import ACTION_MESSAGES, SPIDER_ACTIONS, keyword_action
+
+# Child of main.py's "spider" logger; per-command chatter is debug-level so
+# it costs nothing unless SPIDER_LOGLEVEL=DEBUG
+logger = logging.getLogger("spider.web")
+
+def json_response(payload, status: int = 200) -> Response:
+    """Serialize an API payload to a JSON response"""
+    if ORJSON_AVAILABLE:
+        return Response(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+                        status=status, mimetype='application/json')
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+def minify_html(html: str) -> str:
+    """Drop indentation and blank lines; line breaks stay so // comments in scripts still end"""
+    return '\n'.join(filter(None, map(str.strip, html.splitlines())))
+
+class OrjsonCodec:
+    """orjson behind the dumps/loads interface python-socketio expects of a json module"""
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+def encode_event(payload) -> bytes:
+    """Serialize a SocketIO payload to JSON bytes, sent as-is to every client"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode()
+
+@dataclass(slots=True)
+class CommandRequest:
+    """Body of a POST to /api/command"""
+    command: str = ''
+    
+if MSGSPEC_AVAILABLE:
+    parse_command_request = msgspec.json.Decoder(CommandRequest).decode
+    COMMAND_REQUEST_ERRORS = (msgspec.DecodeError,)
+else:
+    def parse_command_request(body) -> CommandRequest:
+        """Parse a command request body into a CommandRequest"""
+        data = json.loads(body)
+        return CommandRequest(command=str(data.get('command', '')))
+        
+    COMMAND_REQUEST_ERRORS = (ValueError, AttributeError)
 
 # Inline HTML template to avoid template file issues
 HTML_TEMPLATE = '''
@@ -23,7 +101,7 @@ HTML_TEMPLATE = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Hey Spider Robot Dashboard</title>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.7.2/socket.io.js"></script>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.7.2/socket.io.min.js"></script>
     <style>
         * {
             margin: 0;
@@ -268,15 +346,6 @@ HTML_TEMPLATE = '''
                 grid-column: span 1;
             }
         }
-        
-        .error-message {
-            background: rgba(244, 67, 54, 0.2);
-            border: 1px solid #f44336;
-            color: #f44336;
-            padding: 15px;
-            border-radius: 8px;
-            margin: 10px 0;
-        }
     </style>
 </head>
 <body>
@@ -397,16 +466,44 @@ HTML_TEMPLATE = '''
     
     <script>
         // Initialize Socket.IO connection
-        const socket = io();
+        const socket = io({{ socket_options|tojson }});
         let isConnected = false;
         let commandInProgress = false;
+        let commandTimeout = null;
+        // Id of the newest command; only its acknowledgement re-enables the buttons
+        let commandId = 0;
+        let activeCommandButton = null;
         
         // Connection status
         const statusElement = document.getElementById('connectionStatus');
         
+        // Camera is an MJPEG stream; show the placeholder whenever it drops
+        const videoFeed = document.getElementById('videoFeed');
+        const videoPlaceholder = videoFeed.src;
+        videoFeed.onerror = function() {
+            videoFeed.src = videoPlaceholder;
+        };
+        
+        // A hidden tab cannot show video: close the stream (the server's stream
+        // ends on its next write, within WEB_VIDEO_KEEPALIVE) and reopen it
+        // when the tab is visible again
+        function openVideoFeed() {
+            if (!document.hidden) {
+                videoFeed.src = '/video_feed?t=' + Date.now();
+            }
+        }
+        document.addEventListener('visibilitychange', function() {
+            if (document.hidden) {
+                videoFeed.src = videoPlaceholder;
+            } else if (isConnected) {
+                openVideoFeed();
+            }
+        });
+        
         socket.on('connect', function() {
             console.log('Connected to robot');
             isConnected = true;
+            openVideoFeed();
             statusElement.textContent = '🟢 Connected to Hey Spider Robot';
             statusElement.className = 'connection-status connected';
             document.getElementById('aiStatus').textContent = 'Online';
@@ -420,18 +517,26 @@ HTML_TEMPLATE = '''
             document.getElementById('aiStatus').textContent = 'Offline';
         });
         
+        socket.on('server_shutdown', function(data) {
+            console.log('Robot shutting down:', data.message);
+            statusElement.textContent = '🔴 Robot shutting down';
+            statusElement.className = 'connection-status disconnected';
+        });
+        
         // Real-time status updates
-        socket.on('status_update', function(data) {
+        // Status arrives as patches of the fields that changed; keep the full model here
+        const robotStatus = {distance: 50.0, detections: {classes: [], confidences: []}, detection_description: '', ai_thought: '', is_moving: false, emotional_state: 'curious'};
+        // Patches arrive as JSON bytes, serialized once on the server for all clients
+        const patchDecoder = new TextDecoder();
+        socket.on('status_patch', function(raw) {
+            const patch = JSON.parse(patchDecoder.decode(raw));
+            Object.assign(robotStatus, patch);
+            const data = robotStatus;
             try {
-                // Update video feed
-                if (data.video_frame) {
-                    document.getElementById('videoFeed').src = 'data:image/jpeg;base64,' + data.video_frame;
-                }
-                
                 // Update status information
                 document.getElementById('distance').textContent = data.distance.toFixed(1) + ' cm';
                 document.getElementById('moving').textContent = data.is_moving ? 'Yes' : 'No';
-                document.getElementById('detectionCount').textContent = data.detections.length;
+                document.getElementById('detectionCount').textContent = data.detections.classes.length;
                 document.getElementById('emotionalState').textContent = data.emotional_state || 'curious';
                 
                 // Update AI thought
@@ -442,8 +547,10 @@ HTML_TEMPLATE = '''
                 // Update OLED display simulation
                 updateOLEDDisplay(data);
                 
-                // Update detections
-                updateDetections(data.detections);
+                // Update detections, only when they changed
+                if ('detections' in patch || 'detection_description' in patch) {
+                    updateDetections(data.detections, data.detection_description);
+                }
             } catch (error) {
                 console.error('Error updating interface:', error);
             }
@@ -453,7 +560,7 @@ HTML_TEMPLATE = '''
             try {
                 const oledDisplay = document.getElementById('oledDisplay');
                 const mode = data.is_moving ? 'MOVING' : 'READY';
-                const detectionCount = data.detections.length;
+                const detectionCount = data.detections.classes.length;
                 const thought = data.ai_thought ? 
                     (data.ai_thought.length > 20 ? data.ai_thought.substring(0, 20) + '...' : data.ai_thought) : 
                     'Thinking...';
@@ -467,47 +574,29 @@ HTML_TEMPLATE = '''
             }
         }
         
-        function updateDetections(detections) {
+        function updateDetections(detections, description) {
             try {
                 const detectionList = document.getElementById('detectionList');
                 const detectionDesc = document.getElementById('detectionDescription');
                 
-                if (!detections || detections.length === 0) {
+                if (detections.classes.length === 0) {
                     detectionList.innerHTML = '<p style="text-align: center; opacity: 0.7;">No objects detected</p>';
-                    detectionDesc.textContent = "I don't see anything interesting.";
+                    detectionDesc.textContent = description;
                     return;
                 }
                 
-                // Update detection list
+                // Update detection list; detections arrive as parallel columns
+                const classes = detections.classes, confidences = detections.confidences;
                 let html = '';
-                detections.forEach(detection => {
+                for (let i = 0; i < classes.length; i++) {
                     html += `<div class="detection-item">
-                        <span>${detection.class}</span>
-                        <span class="confidence">${(detection.confidence * 100).toFixed(1)}%</span>
+                        <span>${classes[i]}</span>
+                        <span class="confidence">${(confidences[i] * 100).toFixed(1)}%</span>
                     </div>`;
-                });
-                detectionList.innerHTML = html;
-                
-                // Create natural language description
-                const objectCounts = {};
-                detections.forEach(det => {
-                    objectCounts[det.class] = (objectCounts[det.class] || 0) + 1;
-                });
-                
-                const descriptions = [];
-                for (const [objClass, count] of Object.entries(objectCounts)) {
-                    descriptions.push(count === 1 ? `1 ${objClass}` : `${count} ${objClass}s`);
-                }
-                
-                let description;
-                if (descriptions.length === 1) {
-                    description = `I can see ${descriptions[0]}.`;
-                } else if (descriptions.length === 2) {
-                    description = `I can see ${descriptions[0]} and ${descriptions[1]}.`;
-                } else {
-                    description = `I can see ${descriptions.slice(0, -1).join(', ')}, and ${descriptions[descriptions.length - 1]}.`;
                 }
+                detectionList.innerHTML = html;
                 
+                // The server builds the description once per detection result
                 detectionDesc.textContent = description;
             } catch (error) {
                 console.error('Error updating detections:', error);
@@ -536,7 +625,10 @@ HTML_TEMPLATE = '''
                 });
                 
                 console.log('Sending command:', command);
-                socket.emit('command', {command: command});
+                const id = ++commandId;
+                socket.emit('command', {command: command}, function(result) {
+                    commandAcknowledged(id, result);
+                });
                 
                 // Visual feedback
                 const activeBtn = event ? event.target : null;
@@ -544,38 +636,49 @@ HTML_TEMPLATE = '''
                     activeBtn.style.background = 'linear-gradient(45deg, #FF5722, #E64A19)';
                 }
                 
-                // Re-enable buttons after delay
-                setTimeout(() => {
-                    buttons.forEach(btn => {
-                        btn.disabled = false;
-                        btn.classList.remove('pulse');
-                    });
-                    if (activeBtn) {
-                        activeBtn.style.background = 'linear-gradient(45deg, #4CAF50, #45a049)';
-                    }
-                    commandInProgress = false;
-                }, 2000);
+                // Re-enable buttons when the robot acknowledges this command; the
+                // timeout only covers an ack lost to a dropped connection
+                activeCommandButton = activeBtn;
+                commandTimeout = setTimeout(function() { finishCommand(id); }, 30000);
             } catch (error) {
                 console.error('Error sending command:', error);
                 commandInProgress = false;
             }
         }
         
-        socket.on('command_result', function(result) {
+        function finishCommand(id) {
+            // A late ack or timeout from an earlier command must not end this one
+            if (id !== commandId || !commandInProgress) return;
+            clearTimeout(commandTimeout);
+            document.querySelectorAll('.btn').forEach(btn => {
+                btn.disabled = false;
+                btn.classList.remove('pulse');
+            });
+            if (activeCommandButton) {
+                activeCommandButton.style.background = 'linear-gradient(45deg, #4CAF50, #45a049)';
+                activeCommandButton = null;
+            }
+            commandInProgress = false;
+        }
+        
+        function commandAcknowledged(id, result) {
             try {
                 console.log('Command result:', result);
+                if (id !== commandId) return;
+                finishCommand(id);
                 if (!result.success) {
                     alert('Command failed: ' + result.message);
                 }
             } catch (error) {
                 console.error('Error handling command result:', error);
             }
-        });
+        }
         
         // Keyboard shortcuts
         document.addEventListener('keydown', function(event) {
             try {
-                if (event.ctrlKey || event.altKey || event.metaKey) return;
+                // Held keys auto-repeat; only the first press is a command
+                if (event.repeat || event.ctrlKey || event.altKey || event.metaKey) return;
                 
                 switch(event.key.toLowerCase()) {
                     case 'w':
@@ -627,20 +730,29 @@ class WebInterface:
         self.ai = ai_thinking
         self.oled = oled_display
         
-        print("Initializing web interface...")
+        logger.info("Initializing web interface...")
         
         self.app = Flask(__name__)
         self.app.config['SECRET_KEY'] = 'hey_spider_secret_key_2024'
         
+        # WebSocket-only skips the long-polling handshake and upgrade; the
+        # browser client is told to do the same
+        transports = ['websocket'] if settings.WEB_WEBSOCKET_ONLY else ['polling', 'websocket']
+        self.socket_options = {'transports': transports}
+        self._index_page = None
+        self._index_page_gz = None
+        
         # Initialize SocketIO with error handling
         try:
             self.socketio = SocketIO(self.app, cors_allowed_origins="*", 
+                                    async_mode=settings.WEB_ASYNC_MODE,
+                                    transports=transports,
+                                    **({'json': OrjsonCodec} if ORJSON_AVAILABLE else {}),
                                     logger=False, engineio_logger=False,
                                     ping_timeout=60, ping_interval=25)
-            print("SocketIO initialized successfully")
+            logger.info("SocketIO initialized successfully")
         except Exception as e:
-            print(f"SocketIO initialization error: {e}")
-            traceback.print_exc()
+            logger.exception("SocketIO initialization error: %s", e)
             self.socketio = None
         
         self.setup_routes()
@@ -649,6 +761,51 @@ class WebInterface:
         
         # Background task control
         self.background_running = False
+        # Cleared by stop() so open /video_feed generators end
+        self._streaming = True
+        
+        # Connected SocketIO clients; the broadcast idles while there are none
+        self._client_count = 0
+        self._client_lock = threading.Lock()
+        
+        # Each client's (sid) last socket command and when it arrived, to drop rapid repeats
+        self._last_commands = {}
+        
+        # Last JPEG-encoded frame, shared by every video client
+        self._jpeg_frame = None
+        # 16x16 thumbnail of the last encoded frame, to spot a static scene
+        self._jpeg_thumb = None
+        self._jpeg_bytes = None
+        self._jpeg_lock = threading.Lock()
+        # Stream encoding parameters, fixed for the process, and the reused
+        # resize target for stream frames (guarded by _jpeg_lock)
+        self._video_size = tuple(settings.WEB_VIDEO_SIZE)
+        self._jpeg_quality = settings.WEB_VIDEO_QUALITY
+        # Mean per-channel change (0-255) below which a frame counts as static
+        self._static_threshold = settings.WEB_VIDEO_STATIC_THRESHOLD * 16 * 16 * 3
+        self._jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, self._jpeg_quality] if OPENCV_AVAILABLE else None
+        self._resize_buffer = np.empty((self._video_size[1], self._video_size[0], 3), dtype=np.uint8)
+        
+        # Latest gathered status and when it was gathered, shared by the
+        # status API and the broadcast
+        self._status_cache = (0.0, None)
+        
+        # Status as last broadcast; only fields that differ from it are sent.
+        # Replaced, never mutated, so handlers on other threads can encode it safely
+        self._last_status = {}
+        self.jpeg = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self.jpeg = TurboJPEG()
+            except Exception as e:
+                logger.warning("TurboJPEG unavailable, using OpenCV JPEG encoder: %s", e)
+        
+        # OpenCL resize through OpenCV's transparent API (UMat), opt-in since
+        # the upload/download only pays off on a real GPU
+        self.use_opencl = bool(OPENCV_AVAILABLE and settings.WEB_VIDEO_OPENCL and cv2.ocl.haveOpenCL())
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+            logger.info("Using OpenCL for video frame resize")
         
     def setup_routes(self):
         """Setup Flask routes with comprehensive error handling"""
@@ -656,10 +813,20 @@ class WebInterface:
         @self.app.route('/')
         def index():
             try:
-                return render_template_string(HTML_TEMPLATE)
+                # The page only depends on settings, so render and compress it
+                # once and serve the same bytes afterwards
+                if self._index_page is None:
+                    page = render_template_string(minify_html(HTML_TEMPLATE),
+                                                  socket_options=self.socket_options).encode()
+                    self._index_page_gz = gzip.compress(page, 9)
+                    self._index_page = page
+                headers = {'Cache-Control': 'public, max-age=60', 'Vary': 'Accept-Encoding'}
+                if 'gzip' in request.accept_encodings:
+                    headers['Content-Encoding'] = 'gzip'
+                    return Response(self._index_page_gz, mimetype='text/html', headers=headers)
+                return Response(self._index_page, mimetype='text/html', headers=headers)
             except Exception as e:
-                print(f"Template rendering error: {e}")
-                traceback.print_exc()
+                logger.exception("Template rendering error: %s", e)
                 return f"""
                 <html>
                     <head><title>Hey Spider Robot - Error</title></head>
@@ -674,72 +841,39 @@ class WebInterface:
         @self.app.route('/api/status')
         def get_status():
             try:
-                # Safely get data with fallbacks
-                distance = 50.0
-                detections = []
-                detection_description = "Camera initializing..."
-                ai_thought = "Loading..."
-                is_moving = False
-                emotional_state = "curious"
-                
-                try:
-                    if self.spider:
-                        distance = self.spider.get_distance()
-                        is_moving = getattr(self.spider, 'is_moving', False)
-                except Exception as e:
-                    print(f"Error getting spider status: {e}")
-                
-                try:
-                    if self.vision:
-                        detections = self.vision.get_latest_detections() or []
-                        detection_description = self.vision.get_detection_description() or "No detections"
-                except Exception as e:
-                    print(f"Error getting vision status: {e}")
-                
-                try:
-                    if self.ai:
-                        ai_thought = self.ai.get_current_thought() or "Thinking..."
-                        emotional_state = getattr(self.ai, 'emotional_state', 'curious')
-                except Exception as e:
-                    print(f"Error getting AI status: {e}")
-                
-                return jsonify({
-                    'distance': distance,
-                    'detections': detections,
-                    'detection_description': detection_description,
-                    'ai_thought': ai_thought,
-                    'is_moving': is_moving,
-                    'emotional_state': emotional_state,
-                    'status': 'online'
-                })
+                # REST clients keep the {class, confidence, bbox} list; the
+                # columnar form is only for the socket status_patch payload
+                detections = self.vision.detections if self.vision else NO_DETECTIONS
+                return json_response({**self._get_robot_status(), 'detections': detections.as_dicts(),
+                                      'status': 'online'})
             except Exception as e:
-                print(f"Status API error: {e}")
-                traceback.print_exc()
-                return jsonify({
+                logger.exception("Status API error: %s", e)
+                return json_response({
                     'error': str(e),
                     'status': 'error'
-                }), 500
+                }, 500)
             
         @self.app.route('/api/command', methods=['POST'])
         def execute_command():
             try:
-                data = request.get_json() or {}
-                command = data.get('command', '').strip()
+                try:
+                    command = parse_command_request(request.get_data(cache=False)).command.strip()
+                except COMMAND_REQUEST_ERRORS:
+                    return json_response({'success': False, 'message': 'Invalid request'}, 400)
                 
                 if not command:
-                    return jsonify({'success': False, 'message': 'No command provided'}), 400
+                    return json_response({'success': False, 'message': 'No command provided'}, 400)
                 
-                print(f"Web API command received: {command}")
+                logger.debug("Web API command received: %s", command)
                 result = self._execute_command(command)
-                return jsonify(result)
+                return json_response(result)
                 
             except Exception as e:
-                print(f"Command API error: {e}")
-                traceback.print_exc()
-                return jsonify({
+                logger.exception("Command API error: %s", e)
+                return json_response({
                     'success': False, 
                     'message': f'Server error: {str(e)}'
-                }), 500
+                }, 500)
             
         @self.app.route('/api/photo', methods=['POST'])
         def take_photo():
@@ -748,27 +882,36 @@ class WebInterface:
                 if self.vision:
                     filename = self.vision.capture_photo() or ""
                 
-                return jsonify({
+                return json_response({
                     'filename': filename, 
                     'success': bool(filename)
                 })
             except Exception as e:
-                print(f"Photo API error: {e}")
-                return jsonify({
+                logger.error("Photo API error: %s", e)
+                return json_response({
                     'filename': '', 
                     'success': False, 
                     'error': str(e)
                 })
             
+        @self.app.route('/video_feed')
+        def video_feed():
+            """Camera as an MJPEG stream for a plain <img> tag"""
+            if not (self.vision and OPENCV_AVAILABLE):
+                return json_response({'error': 'Camera not available'}, 404)
+            return Response(self._mjpeg_stream(),
+                            mimetype='multipart/x-mixed-replace; boundary=frame')
+            
         @self.app.route('/health')
         def health_check():
             """Simple health check endpoint"""
-            return jsonify({
+            return json_response({
                 'status': 'healthy',
                 'spider': bool(self.spider),
                 'vision': bool(self.vision),
                 'ai': bool(self.ai),
-                'socketio': bool(self.socketio)
+                'socketio': bool(self.socketio),
+                'clients': self._client_count
             })
             
     def setup_socket_events(self):
@@ -779,93 +922,123 @@ class WebInterface:
         @self.socketio.on('connect')
         def handle_connect():
             try:
-                print('Web client connected')
+                with self._client_lock:
+                    self._client_count += 1
+                logger.debug("Web client connected")
                 emit('status', 'Connected to Hey Spider Robot')
+                # New clients start from the full status, then follow the patches
+                emit('status_patch', encode_event(self._last_status))
             except Exception as e:
-                print(f"Socket connect error: {e}")
+                logger.error("Socket connect error: %s", e)
             
         @self.socketio.on('disconnect')
         def handle_disconnect():
             try:
-                print('Web client disconnected')
+                with self._client_lock:
+                    self._client_count = max(0, self._client_count - 1)
+                self._last_commands.pop(request.sid, None)
+                logger.debug("Web client disconnected")
             except Exception as e:
-                print(f"Socket disconnect error: {e}")
+                logger.error("Socket disconnect error: %s", e)
             
         @self.socketio.on('command')
         def handle_command(data):
             try:
                 command = data.get('command', '') if data else ''
-                print(f"Socket command received: {command}")
-                result = self._execute_command(command)
-                emit('command_result', result)
+                logger.debug("Socket command received: %s", command)
+                # The same command again from the same client within a moment (a
+                # double click) is a repeat: acknowledge it without running it twice
+                now = time.monotonic()
+                last_command, last_at = self._last_commands.get(request.sid, ('', 0.0))
+                if command == last_command and now - last_at < settings.WEB_COMMAND_DEDUP_WINDOW:
+                    return {'success': True, 'message': 'Command already received'}
+                self._last_commands[request.sid] = (command, now)
+                # Returned, not emitted: the result is the ack for this exact command
+                return self._execute_command(command)
             except Exception as e:
-                print(f"Socket command error: {e}")
-                traceback.print_exc()
-                emit('command_result', {
+                logger.exception("Socket command error: %s", e)
+                return {
                     'success': False, 
                     'message': f'Error: {str(e)}'
-                })
+                }
             
+    def _get_robot_status(self) -> dict:
+        """Gather robot status with safe fallbacks, reusing a very recent result"""
+        now = time.monotonic()
+        cached_at, cached = self._status_cache
+        if cached is not None and now - cached_at < settings.WEB_STATUS_CACHE_TTL:
+            return cached
+        
+        status = {
+            'distance': 50.0,
+            'detections': NO_DETECTIONS.as_columns(),
+            'detection_description': "Camera initializing...",
+            'ai_thought': "Loading...",
+            'is_moving': False,
+            'emotional_state': "curious"
+        }
+        
+        try:
+            if self.spider:
+                status['distance'] = self.spider.get_distance()
+                status['is_moving'] = self.spider.is_moving
+        except Exception as e:
+            logger.error("Error getting spider status: %s", e)
+        
+        try:
+            if self.vision:
+                # Parallel class/confidence columns for the socket payload, built
+                # once per detection result (/api/status swaps in the dict list)
+                status['detections'] = self.vision.detections.as_columns()
+                status['detection_description'] = self.vision.get_detection_description() or "No detections"
+        except Exception as e:
+            logger.error("Error getting vision status: %s", e)
+        
+        try:
+            if self.ai:
+                status['ai_thought'] = self.ai.get_current_thought() or "Thinking..."
+                status['emotional_state'] = self.ai.emotional_state
+        except Exception as e:
+            logger.error("Error getting AI status: %s", e)
+        
+        # Swapped in as one tuple so readers never see a half-updated cache
+        self._status_cache = (now, status)
+        return status
+        
     def _execute_command(self, command: str) -> dict:
         """Execute a robot command with comprehensive error handling"""
         if not command:
             return {'success': False, 'message': 'Empty command'}
             
         command = command.lower().strip()
-        print(f"Executing command: {command}")
+        logger.debug("Executing command: %s", command)
         
         # Update OLED if available
         try:
             if self.oled:
                 self.oled.update_command(command)
         except Exception as e:
-            print(f"OLED update error: {e}")
+            logger.error("OLED update error: %s", e)
             
         try:
-            # Basic movement commands
-            if any(word in command for word in ['forward', 'walk', 'move']):
+            # Keyword commands - the highest-priority action named wins
+            action = keyword_action(command)
+            spider_action = SPIDER_ACTIONS.get(action)
+            if spider_action:
                 if self.spider:
-                    self.spider.walk_forward()
-                    return {'success': True, 'message': 'Walking forward'}
+                    spider_action(self.spider)
+                    return {'success': True, 'message': ACTION_MESSAGES[action]}
                 else:
                     return {'success': False, 'message': 'Spider controller not available'}
                 
-            elif 'left' in command:
-                if self.spider:
-                    self.spider.turn_left()
-                    return {'success': True, 'message': 'Turning left'}
-                else:
-                    return {'success': False, 'message': 'Spider controller not available'}
-                
-            elif 'right' in command:
-                if self.spider:
-                    self.spider.turn_right()
-                    return {'success': True, 'message': 'Turning right'}
-                else:
-                    return {'success': False, 'message': 'Spider controller not available'}
-                
-            elif 'dance' in command:
-                if self.spider:
-                    self.spider.dance()
-                    return {'success': True, 'message': 'Dancing!'}
-                else:
-                    return {'success': False, 'message': 'Spider controller not available'}
-                
-            elif 'wave' in command:
-                if self.spider:
-                    self.spider.wave()
-                    return {'success': True, 'message': 'Waving hello!'}
-                else:
-                    return {'success': False, 'message': 'Spider controller not available'}
-                
-            elif any(word in command for word in ['photo', 'picture', 'capture']):
+            elif action == 'take_photo':
                 if self.vision:
                     filename = self.vision.capture_photo()
                     return {'success': bool(filename), 'message': f'Photo saved: {filename}' if filename else 'Photo capture failed'}
                 else:
                     return {'success': False, 'message': 'Vision system not available'}
                 
-            elif 'stop' in command:
+            elif action == 'stop':
                 return {'success': True, 'message': 'Stopped'}
                 
             else:
@@ -873,117 +1046,155 @@ class WebInterface:
                 if self.ai:
                     try:
                         ai_response = self.ai.process_command(command)
-                        parsed_response = json.loads(ai_response)
-                        action = parsed_response.get('action', 'unknown')
+                        parsed_response = parse_ai_response(ai_response)
+                        action = parsed_response.action
                         
-                        if action == 'walk_forward' and self.spider:
-                            self.spider.walk_forward()
-                        elif action == 'turn_left' and self.spider:
-                            self.spider.turn_left()
-                        elif action == 'turn_right' and self.spider:
-                            self.spider.turn_right()
-                        elif action == 'dance' and self.spider:
-                            self.spider.dance()
-                        elif action == 'wave' and self.spider:
-                            self.spider.wave()
+                        spider_action = SPIDER_ACTIONS.get(action)
+                        if spider_action and self.spider:
+                            spider_action(self.spider)
                         elif action == 'take_photo' and self.vision:
                             self.vision.capture_photo()
                             
                         return {
                             'success': action != 'unknown',
-                            'message': parsed_response.get('response', 'Command processed by AI')
+                            'message': parsed_response.response or 'Command processed by AI'
                         }
-                    except (json.JSONDecodeError, KeyError) as e:
-                        print(f"AI response parsing error: {e}")
+                    except AI_RESPONSE_ERRORS as e:
+                        logger.error("AI response parsing error: %s", e)
                         return {'success': False, 'message': 'AI could not process command'}
                 else:
                     return {'success': False, 'message': 'Unknown command and AI not available'}
                     
         except Exception as e:
-            print(f"Command execution error: {e}")
-            traceback.print_exc()
+            logger.exception("Command execution error: %s", e)
             return {'success': False, 'message': f'Error: {str(e)}'}
             
+    def _encode_frame(self, frame) -> Optional[bytes]:
+        """JPEG-encode a frame for streaming, once per frame however many clients watch"""
+        with self._jpeg_lock:
+            if frame is not self._jpeg_frame:
+                # A new frame that looks the same as the last encoded one (no
+                # motion, only sensor noise) keeps the old encode. Comparing
+                # with the last *encoded* thumbnail lets slow drift add up
+                thumb = cv2.resize(frame, (16, 16), interpolation=cv2.INTER_AREA)
+                if (self._jpeg_thumb is not None and
+                        cv2.norm(thumb, self._jpeg_thumb, cv2.NORM_L1) < self._static_threshold):
+                    self._jpeg_frame = frame
+                    return self._jpeg_bytes
+                self._jpeg_thumb = thumb
+                # Resize frame for web streaming; INTER_AREA at an exact 2x
+                # reduction takes OpenCV's vectorized (SSE/NEON) fast path
+                size = self._video_size
+                if frame.shape[1::-1] == size:
+                    # Camera already delivers the stream size; nothing to resize
+                    frame_resized = frame
+                elif self.use_opencl:
+                    frame_resized = cv2.resize(cv2.UMat(frame), size, interpolation=cv2.INTER_AREA).get()
+                else:
+                    frame_resized = cv2.resize(frame, size, dst=self._resize_buffer,
+                                               interpolation=cv2.INTER_AREA)
+                if self.jpeg:
+                    # 4:2:0 like cv2.imencode; TurboJPEG's own default is 4:2:2
+                    self._jpeg_bytes = self.jpeg.encode(frame_resized, quality=self._jpeg_quality,
+                                                        pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+                else:
+                    ok, buffer = cv2.imencode('.jpg', frame_resized, self._jpeg_params)
+                    self._jpeg_bytes = buffer.tobytes() if ok else None
+                self._jpeg_frame = frame
+            return self._jpeg_bytes
+            
+    def _mjpeg_stream(self):
+        """Yield multipart JPEG parts whenever the camera has a new frame, until the server stops"""
+        interval = 1 / settings.WEB_VIDEO_FPS
+        keepalive = settings.WEB_VIDEO_KEEPALIVE
+        # Yield to the server's event loop under eventlet/gevent instead of
+        # blocking it with time.sleep
+        sleep = self.socketio.sleep if self.socketio else time.sleep
+        # With real threads, wake as soon as the camera publishes a frame; a
+        # green-thread server must not block in a threading.Condition
+        wait_for_frame = self.socketio is None or self.socketio.async_mode == 'threading'
+        last_frame = last_jpeg = None
+        # Before the first part, a bare CRLF is multipart preamble and ignored
+        part = b'\r\n'
+        last_sent = time.monotonic()
+        while self._streaming:
+            try:
+                if wait_for_frame:
+                    frame = self.vision.wait_for_frame(last_frame)
+                else:
+                    frame = self.vision.get_latest_frame()
+                if frame is not None and frame is not last_frame:
+                    jpeg = self._encode_frame(frame)
+                    last_frame = frame
+                    # A static scene hands back the same encode; don't resend it
+                    if jpeg and jpeg is not last_jpeg:
+                        last_jpeg = jpeg
+                        part = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n'
+                        last_sent = time.monotonic()
+                        yield part
+            except Exception as e:
+                logger.error("Frame encoding error: %s", e)
+            # No new frame (static scene, mock mode, stopped camera): re-send the
+            # last part now and then, so writing to a closed socket ends the generator
+            if time.monotonic() - last_sent >= keepalive:
+                last_sent = time.monotonic()
+                yield part
+            sleep(interval)
+            
     def start_background_tasks(self):
         """Start background tasks for real-time updates"""
         if not self.socketio:
-            print("SocketIO not available, skipping background tasks")
+            logger.warning("SocketIO not available, skipping background tasks")
             return
             
         def broadcast_status():
-            print("Starting background status broadcast...")
+            logger.debug("Starting background status broadcast...")
+            interval = settings.WEB_STATUS_INTERVAL
+            snapshot_interval = settings.WEB_STATUS_SNAPSHOT_INTERVAL
+            next_snapshot = time.monotonic() + snapshot_interval
             while self.background_running:
                 try:
-                    # Prepare status data with safe fallbacks
-                    status_data = {
-                        'distance': 50.0,
-                        'detections': [],
-                        'ai_thought': 'System running...',
-                        'is_moving': False,
-                        'emotional_state': 'curious'
-                    }
+                    # Nobody watching: skip gathering status. A client that connects
+                    # later starts from the last broadcast and catches up on the next patch
+                    if not self._client_count:
+                        self.socketio.sleep(interval)
+                        continue
                     
-                    # Safely gather data from each component
-                    try:
-                        if self.spider:
-                            status_data['distance'] = self.spider.get_distance()
-                            status_data['is_moving'] = getattr(self.spider, 'is_moving', False)
-                    except Exception as e:
-                        print(f"Error getting spider data: {e}")
+                    status_data = self._get_robot_status()
                     
-                    try:
-                        if self.vision:
-                            status_data['detections'] = self.vision.get_latest_detections() or []
-                    except Exception as e:
-                        print(f"Error getting vision data: {e}")
+                    # Broadcast only what changed to all connected clients
+                    patch = {key: value for key, value in status_data.items()
+                             if key not in self._last_status or self._last_status[key] != value}
+                    if patch:
+                        self._last_status = {**self._last_status, **patch}
+                    # Now and then send everything, so a client that missed a
+                    # patch does not stay out of date
+                    now = time.monotonic()
+                    if now >= next_snapshot:
+                        patch = self._last_status
+                        next_snapshot = now + snapshot_interval
+                    if patch:
+                        try:
+                            # Binary attachments skip per-client JSON encoding
+                            self.socketio.emit('status_patch', encode_event(patch))
+                        except Exception as e:
+                            logger.error("Socket emit error: %s", e)
                     
-                    try:
-                        if self.ai:
-                            status_data['ai_thought'] = self.ai.get_current_thought() or "Thinking..."
-                            status_data['emotional_state'] = getattr(self.ai, 'emotional_state', 'curious')
-                    except Exception as e:
-                        print(f"Error getting AI data: {e}")
-                    
-                    # Add video frame if available
-                    try:
-                        if self.vision and OPENCV_AVAILABLE:
-                            frame = self.vision.get_latest_frame()
-                            if frame is not None:
-                                # Resize frame for web streaming
-                                frame_resized = cv2.resize(frame, (320, 240))
-                                _, buffer = cv2.imencode('.jpg', frame_resized, 
-                                                       [cv2.IMWRITE_JPEG_QUALITY, 70])
-                                frame_data = base64.b64encode(buffer).decode('utf-8')
-                                status_data['video_frame'] = frame_data
-                            else:
-                                status_data['video_frame'] = None
-                        else:
-                            status_data['video_frame'] = None
-                    except Exception as e:
-                        print(f"Frame encoding error: {e}")
-                        status_data['video_frame'] = None
-                        
-                    # Broadcast to all connected clients
-                    try:
-                        self.socketio.emit('status_update', status_data)
-                    except Exception as e:
-                        print(f"Socket emit error: {e}")
-                    
-                    time.sleep(1)  # Update every second
+                    self.socketio.sleep(interval)
                     
                 except Exception as e:
-                    print(f"Broadcast error: {e}")
-                    traceback.print_exc()
-                    time.sleep(5)
+                    logger.exception("Broadcast error: %s", e)
+                    self.socketio.sleep(5)
                     
-        # Start background thread
+        # Start as a SocketIO background task so it runs as a green thread
+        # under eventlet/gevent and a real thread under threading
         self.background_running = True
-        threading.Thread(target=broadcast_status, daemon=True).start()
-        print("Background tasks started")
+        self.socketio.start_background_task(broadcast_status)
+        logger.info("Background tasks started")
         
     def run(self, host='0.0.0.0', port=5000, debug=False):
         """Run the web interface with comprehensive error handling"""
-        print(f"Starting web interface on http://{host}:{port}")
+        logger.info("Starting web interface on http://%s:%s", host, port)
         
         # Start background tasks if SocketIO is available
         if self.socketio:
@@ -997,22 +1208,31 @@ class WebInterface:
                     host=host, 
                     port=port, 
                     debug=debug,
-                    allow_unsafe_werkzeug=True,
-                    log_output=True
+                    use_reloader=False,
+                    # Per-request access lines only when debugging
+                    log_output=debug,
+                    # Werkzeug is only used (and only needs this) in threading mode
+                    **({'allow_unsafe_werkzeug': True} if self.socketio.async_mode == 'threading' else {})
                 )
             else:
                 # Fallback to regular Flask if SocketIO failed
-                print("Running in fallback mode without SocketIO")
-                self.app.run(host=host, port=port, debug=debug)
+                logger.warning("Running in fallback mode without SocketIO")
+                self.app.run(host=host, port=port, debug=debug, use_reloader=False)
                 
         except Exception as e:
-            print(f"Web interface startup error: {e}")
-            traceback.print_exc()
+            logger.exception("Web interface startup error: %s", e)
             raise
         finally:
             self.background_running = False
             
     def stop(self):
-        """Stop background tasks"""
+        """Stop background tasks and tell connected clients the server is going away"""
         self.background_running = False
-        print("Web interface stopped")
\ No newline at end of file
+        self._streaming = False
+        if self.socketio and self._client_count:
+            try:
+                # One broadcast reaches every client; no per-client emits
+                self.socketio.emit('server_shutdown', {'message': 'Server shutting down'})
+            except Exception as e:
+                logger.error("Socket emit error: %s", e)
+        logger.info("Web interface stopped")
\ No newline at end of file